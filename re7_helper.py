@@ -23,12 +23,18 @@ Run:
   python3 re7_helper.py
 """
 
+import heapq
 import os
+import re
+import sys
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
 
 # ============================================================
 # GAME MODE DEFINITIONS
 # ============================================================
-GAME_MODES = {
+GAME_MODES = MappingProxyType({
     "1": {
         "name": "Normal 21",
         "desc": "Single match against Lucas. Learn the basics.",
@@ -70,12 +76,12 @@ GAME_MODES = {
             "Completion unlocks 'Perfect Draw' trump and the trophy."
         ),
     },
-}
+})
 
 # ============================================================
 # OPPONENT DATABASE — Ordered lists per mode
 # ============================================================
-OPPONENTS_NORMAL = [
+OPPONENTS_NORMAL = (
     {
         "name": "Lucas",
         "mode": "Normal 21",
@@ -91,9 +97,9 @@ OPPONENTS_NORMAL = [
             "The solver is optimized for Survival and Survival+ modes."
         ),
     },
-]
+)
 
-OPPONENTS_SURVIVAL = [
+OPPONENTS_SURVIVAL = (
     {
         "name": "Tally Mark Hoffman",
         "mode": "Survival",
@@ -177,9 +183,9 @@ OPPONENTS_SURVIVAL = [
             "Winning this unlocks Survival+ mode."
         ),
     },
-]
+)
 
-OPPONENTS_SURVIVAL_PLUS = [
+OPPONENTS_SURVIVAL_PLUS = (
     {
         "name": "Tally Mark Hoffman",
         "mode": "Survival+",
@@ -310,7 +316,7 @@ OPPONENTS_SURVIVAL_PLUS = [
             "He may re-play Escape each round — save multiple Destroys."
         ),
     },
-]
+)
 
 # Fixed bosses in Survival+ (always appear at specific positions)
 BOSS_SURVIVAL_PLUS_MID = {
@@ -388,10 +394,69 @@ BOSS_SURVIVAL_PLUS_FINAL = {
     ),
 }
 
+
+# Categorical fields repeated across many entries: interned so each distinct
+# value is a single string object.
+_INTERNED_FIELDS = frozenset(("cat", "etype", "ai", "mode"))
+
+
+def _freeze(value):
+    """Recursively turn static-table dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({
+            k: sys.intern(v) if k in _INTERNED_FIELDS and isinstance(v, str) else _freeze(v)
+            for k, v in value.items()
+        })
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Opponent intel is read-only at runtime (fight_opponent copies before
+# applying a variant), so freeze every entry.
+OPPONENTS_NORMAL = _freeze(list(OPPONENTS_NORMAL))
+OPPONENTS_SURVIVAL = _freeze(list(OPPONENTS_SURVIVAL))
+OPPONENTS_SURVIVAL_PLUS = _freeze(list(OPPONENTS_SURVIVAL_PLUS))
+BOSS_SURVIVAL_PLUS_MID = _freeze(BOSS_SURVIVAL_PLUS_MID)
+BOSS_SURVIVAL_PLUS_FINAL = _freeze(BOSS_SURVIVAL_PLUS_FINAL)
+
+# Every opponent entry, in menu order.
+_ALL_OPPONENTS = (
+    OPPONENTS_NORMAL + OPPONENTS_SURVIVAL + OPPONENTS_SURVIVAL_PLUS
+    + (BOSS_SURVIVAL_PLUS_MID, BOSS_SURVIVAL_PLUS_FINAL)
+)
+
+# Every name an opponent can be shown under (base name, or "Name (Variant)"
+# after fight_opponent's variant pick) that counts as a boss fight.
+_BOSS_NAMES = frozenset(
+    name
+    for o in _ALL_OPPONENTS
+    for name in (o["name"], *(f"{o['name']} ({key})" for key in o.get("variants", ())))
+    if "Boss" in name or "Undead" in name or "Molded" in name
+)
+
+# Opponent roster per GAME_MODES key (Survival+ is the random pool; bosses
+# are picked by fight number in select_survival_plus_opponent).
+_OPPONENT_LISTS = {
+    "1": OPPONENTS_NORMAL,
+    "2": OPPONENTS_SURVIVAL,
+    "3": OPPONENTS_SURVIVAL_PLUS,
+}
+
+# Survival+ pick-list labels, rendered once; the Big Head entry (beat him to
+# unlock Harvest) is flagged by index.
+_SURVIVAL_PLUS_LABELS = tuple(
+    f" {i + 1}. {opp['name']} — {opp.get('desc', '')}"
+    for i, opp in enumerate(OPPONENTS_SURVIVAL_PLUS)
+)
+_SURVIVAL_PLUS_BIG_HEAD = frozenset(
+    i for i, opp in enumerate(OPPONENTS_SURVIVAL_PLUS) if "Big Head" in opp["name"]
+)
+
 # ============================================================
 # TRUMP CARD DATABASE
 # ============================================================
-TRUMPS = {
+TRUMPS = _freeze({
     # ── Bet Up — increases OPPONENT's bet while on table ──
     #   weight: utility value (higher = save for harder fights). 0 = enemy-only card.
     #   etype: "Bet Modifier", "Draw Forcer", "Board Wipe", "Target Modifier", "Defensive", "Special", "Attack"
@@ -477,58 +542,105 @@ TRUMPS = {
     "Escape": {"cat": "Special", "desc": "You don't take damage if you lose while on table. Match resets if used.", "weight": 0, "etype": "Special"},
     "Oblivion": {"cat": "Special", "desc": "Cancels this round. Begins a new round. No damage to either side.", "weight": 0, "etype": "Special"},
     "Desperation": {"cat": "Special", "desc": "Story-only. Both bets become 100. Opponent can't draw cards.", "weight": 0, "etype": "Special"},
-}
+})
+
+# Column-wise view of TRUMPS: field tuples indexed by TRUMP_ID[name].
+TRUMP_NAMES = tuple(TRUMPS)
+TRUMP_ID = MappingProxyType({name: i for i, name in enumerate(TRUMP_NAMES)})
+TRUMP_CATS = tuple(TRUMPS[name]["cat"] for name in TRUMP_NAMES)
+TRUMP_DESCS = tuple(TRUMPS[name]["desc"] for name in TRUMP_NAMES)
+TRUMP_WEIGHTS = tuple(TRUMPS[name]["weight"] for name in TRUMP_NAMES)
+
+# Name-keyed lookups for the hot paths (sort keys, hand display).
+TRUMP_WEIGHT = MappingProxyType(dict(zip(TRUMP_NAMES, TRUMP_WEIGHTS)))
+TRUMP_DESC = MappingProxyType(dict(zip(TRUMP_NAMES, TRUMP_DESCS)))
+
+# One bit per trump (in TRUMP_ID order) so a trump kit packs into a single int.
+TRUMP_BITS = MappingProxyType({name: 1 << i for name, i in TRUMP_ID.items()})
+
+
+@lru_cache(maxsize=None)
+def trump_mask(names: tuple) -> int:
+    """Pack a tuple of trump names into a TRUMP_BITS mask (unknown names ignored)."""
+    mask = 0
+    for name in names:
+        mask |= TRUMP_BITS.get(name, 0)
+    return mask
+
+
+# Enemy trumps worth giving trump advice for even when comfortably ahead.
+_ENEMY_THREAT_MASK = trump_mask((
+    "Dead Silence", "Black Magic", "Curse", "Escape",
+    "Mind Shift", "Mind Shift+", "Desire", "Desire+",
+    "Shield Assault", "Shield Assault+", "Twenty-One Up",
+    "Oblivion", "Destroy+", "Destroy++",
+))
+
+# Trump families recommend_trump_play counts in a hand, resolved once by name
+# instead of prefix-scanning every card per call.
+_DESTROY_TRUMPS = frozenset(n for n in TRUMP_NAMES if n.startswith("Destroy"))
+_SHIELD_TRUMPS = frozenset(n for n in TRUMP_NAMES if n.startswith("Shield") and "Assault" not in n)
+_BET_UP_TRUMPS = frozenset(n for n in TRUMP_NAMES if n.startswith(("One-Up", "Two-Up")))
 
 # ============================================================
 # CHALLENGE / UNLOCK TRACKING
 # ============================================================
-CHALLENGE_GOALS = {
+CHALLENGE_GOALS = _freeze({
     "beat_normal": {
         "name": "Beat Normal 21 (story mode)",
         "reward": "Unlocks Survival mode",
-        "unlocks_trumps": [],
+        "unlocks_trumps": (),
     },
     "beat_survival": {
         "name": "Beat Survival mode",
         "reward": "Unlocks Survival+ mode, Perfect Draw+",
-        "unlocks_trumps": ["Perfect Draw+"],
+        "unlocks_trumps": ("Perfect Draw+",),
     },
     "beat_survival_plus": {
         "name": "Beat Survival+ mode",
         "reward": "Achievement: You Gotta Know When To Hold 'Em",
-        "unlocks_trumps": [],
+        "unlocks_trumps": (),
     },
     "bust_win": {
         "name": "Win a round while bust",
         "reward": "Starting Trump Card +1",
-        "unlocks_trumps": [],
+        "unlocks_trumps": (),
     },
     "fifteen_trumps": {
         "name": "Use 15+ trump cards in a single round",
         "reward": "Trump Switch+",
-        "unlocks_trumps": ["Trump Switch+"],
+        "unlocks_trumps": ("Trump Switch+",),
     },
     "no_damage_survival": {
         "name": "Beat Survival without taking damage",
         "reward": "Ultimate Draw",
-        "unlocks_trumps": ["Ultimate Draw"],
+        "unlocks_trumps": ("Ultimate Draw",),
     },
     "no_damage_survival_plus": {
         "name": "Beat Survival+ without taking damage",
         "reward": "Grand Reward",
-        "unlocks_trumps": [],
+        "unlocks_trumps": (),
     },
     "three_21s": {
         "name": "Reach exactly 21 three times in a row",
         "reward": "Go for 27",
-        "unlocks_trumps": ["Go for 27"],
+        "unlocks_trumps": ("Go for 27",),
     },
     "opponents_defeated": {
         "name": "Defeat multiple opponents (cumulative)",
         "reward": "Shield+, Two Up+, Go for 24 (at milestones)",
-        "unlocks_trumps": ["Shield+", "Two-Up+", "Go for 24"],
+        "unlocks_trumps": ("Shield+", "Two-Up+", "Go for 24"),
     },
-}
+})
+
+# Trumps unlocked by each challenge, so progress setup is a single set union.
+_UNLOCKS_BY_CHALLENGE = MappingProxyType({
+    key: frozenset(goal.get("unlocks_trumps", ())) for key, goal in CHALLENGE_GOALS.items()
+})
+
+# Integer tokens in free-form menu input ("1 2 5", "1,2,5"); signs are kept so
+# negatives fall out of range instead of parsing as positive numbers.
+_INT_RE = re.compile(r"-?\d+")
 
 
 def setup_challenge_progress(force_prompt=False):
@@ -545,33 +657,28 @@ def setup_challenge_progress(force_prompt=False):
 
     completed = set()
     print_header("CHALLENGE PROGRESS")
-    print(" Which challenges have you already completed?")
-    print(" (This determines which trump cards you have access to)\n")
-
+    lines = [
+        " Which challenges have you already completed?",
+        " (This determines which trump cards you have access to)\n",
+    ]
     challenges = list(CHALLENGE_GOALS.items())
     for i, (key, goal) in enumerate(challenges, 1):
-        print(f" {i:>2}. {goal['name']}")
-        print(f"      → {goal['reward']}")
-
-    print(f"\n Enter numbers for COMPLETED challenges (e.g., '1 2 5'), or 'all', or Enter for none:")
-    raw = input(" > ").strip().lower()
+        lines.append(f" {i:>2}. {goal['name']}")
+        lines.append(f"      → {goal['reward']}")
+    lines.append("\n Enter numbers for COMPLETED challenges (e.g., '1 2 5'), or 'all', or Enter for none:")
+    emit(*lines)
+    raw = prompt(" > ").strip().lower()
 
     if raw == "all":
         completed = set(CHALLENGE_GOALS.keys())
     elif raw:
-        try:
-            indices = [int(x) for x in raw.split()]
-            for idx in indices:
-                if 1 <= idx <= len(challenges):
-                    completed.add(challenges[idx - 1][0])
-        except ValueError:
+        indices = [int(x) for x in _INT_RE.findall(raw)]
+        if not indices:
             print(" Couldn't parse input, starting with no challenges completed.")
+        completed = {challenges[idx - 1][0] for idx in indices if 1 <= idx <= len(challenges)}
 
     # Derive available trump cards from completed challenges
-    available_trumps = set()
-    for key in completed:
-        goal = CHALLENGE_GOALS.get(key, {})
-        available_trumps.update(goal.get("unlocks_trumps", []))
+    available_trumps = set().union(*(_UNLOCKS_BY_CHALLENGE[key] for key in completed))
 
     if completed:
         print(f"\n Completed: {len(completed)} challenges")
@@ -589,20 +696,41 @@ def setup_challenge_progress(force_prompt=False):
 # ============================================================
 # SAVE / LOAD SYSTEM
 # ============================================================
-import json
-
 SAVE_FILE = os.path.join(os.path.expanduser("~"), ".re7_21_progress.json")
+# Saves are written here first, then swapped in, so a crash can't truncate SAVE_FILE.
+_SAVE_TMP = SAVE_FILE + ".tmp"
+
+# Last progress written or read this session: ((st_mtime_ns, st_size) of the
+# file, (challenges, trumps) frozensets). Reused while the file stat matches.
+_progress_cache = None
 
 
 def save_progress(challenges_completed: set, available_trumps: set) -> None:
     """Persist challenge progress to disk."""
+    global _progress_cache
+    progress = (frozenset(challenges_completed), frozenset(available_trumps))
+    if _progress_cache is not None and _progress_cache[1] == progress:
+        # Same payload as the last save/load: skip the write if the file is untouched.
+        try:
+            st = os.stat(SAVE_FILE)
+            if (st.st_mtime_ns, st.st_size) == _progress_cache[0]:
+                print(f" ✓ Progress unchanged — {SAVE_FILE} not rewritten")
+                return
+        except OSError:
+            pass
+
+    import json  # deferred: only needed once progress is actually saved/loaded
+
     data = {
         "challenges_completed": sorted(challenges_completed),
         "available_trumps": sorted(available_trumps),
     }
     try:
-        with open(SAVE_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(_SAVE_TMP, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(_SAVE_TMP, SAVE_FILE)
+        st = os.stat(SAVE_FILE)
+        _progress_cache = ((st.st_mtime_ns, st.st_size), progress)
         print(f" ✓ Progress saved to {SAVE_FILE}")
     except OSError as e:
         print(f" ⚠ Could not save: {e}")
@@ -610,14 +738,27 @@ def save_progress(challenges_completed: set, available_trumps: set) -> None:
 
 def load_progress():
     """Load challenge progress from disk. Returns (challenges, trumps) or (None, None)."""
+    global _progress_cache
     try:
-        with open(SAVE_FILE, "r") as f:
-            data = json.load(f)
-        challenges = set(data.get("challenges_completed", []))
-        trumps = set(data.get("available_trumps", []))
-        return challenges, trumps
-    except (OSError, json.JSONDecodeError, KeyError):
+        st = os.stat(SAVE_FILE)
+    except OSError:
         return None, None
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _progress_cache is None or _progress_cache[0] != stamp:
+        import json
+
+        try:
+            with open(SAVE_FILE, "r") as f:
+                data = json.load(f)
+            _progress_cache = (stamp, (
+                frozenset(data.get("challenges_completed", [])),
+                frozenset(data.get("available_trumps", [])),
+            ))
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None, None
+    # Callers may update their sets in place, so hand out copies.
+    challenges, trumps = _progress_cache[1]
+    return set(challenges), set(trumps)
 
 
 # ============================================================
@@ -639,31 +780,47 @@ PLAYER_TRUMPS = [
     "Trump Switch", "Trump Switch+", "Harvest",
 ]
 
+# Cards that require unlocking via challenges before they show up in the add list.
+_UNLOCKABLE = frozenset({"Perfect Draw+", "Ultimate Draw", "Trump Switch+", "Shield+",
+                         "Two-Up+", "Go for 24", "Go for 27", "Harvest"})
+_DRAW_CARDS = ("Perfect Draw", "Perfect Draw+", "Ultimate Draw")
+# (name, value) for the fixed-value draw cards "2 Card" … "7 Card".
+_NUM_CARDS = tuple((f"{n} Card", n) for n in range(2, 8))
+
+# Names folded for typed lookup: lowercase, punctuation/spaces dropped.
+# "+" is kept so Shield / Shield+ / Destroy++ stay distinct.
+_NAME_FOLD_RE = re.compile(r"[^a-z0-9+]")
+
+
+def _fold_name(name: str) -> str:
+    return _NAME_FOLD_RE.sub("", name.lower())
+
+
+_PLAYER_TRUMPS_FOLDED = MappingProxyType({n: _fold_name(n) for n in PLAYER_TRUMPS})
+
 
 def display_trump_hand(trump_hand: list) -> None:
     """Display player's current trump cards."""
     if not trump_hand:
         print("\n No trump cards in hand.")
         return
-    print("\n ┌─ YOUR TRUMP CARDS ──────────────────────────────┐")
-    for i, card in enumerate(trump_hand, 1):
-        desc = TRUMPS.get(card, {}).get("desc", "")
-        print(f" │ {i:>2}. {card:<20s} {desc[:35]:<35s}│")
-    print(" └─────────────────────────────────────────────────┘")
+    desc = TRUMP_DESC.get
+    emit("\n ┌─ YOUR TRUMP CARDS ──────────────────────────────┐",
+         *(f" │ {i:>2}. {card:<20s} {desc(card, '')[:35]:<35s}│"
+           for i, card in enumerate(trump_hand, 1)),
+         " └─────────────────────────────────────────────────┘")
 
 
 def edit_trump_hand(trump_hand: list, available_trumps: set = None) -> list:
     """Let user add/remove trump cards from their hand.
     available_trumps: if provided, only show unlocked cards in the add list."""
     # Cards that require unlocking — if available_trumps is set, filter these
-    UNLOCKABLE = {"Perfect Draw+", "Ultimate Draw", "Trump Switch+", "Shield+",
-                  "Two-Up+", "Go for 24", "Go for 27", "Harvest"}
-
     if available_trumps is not None:
         allowed = [c for c in PLAYER_TRUMPS
-                   if c not in UNLOCKABLE or c in available_trumps]
+                   if c not in _UNLOCKABLE or c in available_trumps]
     else:
         allowed = PLAYER_TRUMPS  # No filtering — show all
+    allowed_folded = [(_PLAYER_TRUMPS_FOLDED[n], n) for n in allowed]
 
     while True:
         display_trump_hand(trump_hand)
@@ -672,7 +829,7 @@ def edit_trump_hand(trump_hand: list, available_trumps: set = None) -> list:
         print("  -  Remove a trump card (by number)")
         print("  c  Clear all")
         print("  Enter  Done")
-        choice = input(" > ").strip().lower()
+        choice = prompt(" > ").strip().lower()
 
         if not choice:
             return trump_hand
@@ -683,7 +840,7 @@ def edit_trump_hand(trump_hand: list, available_trumps: set = None) -> list:
             if not trump_hand:
                 print(" Hand is empty.")
                 continue
-            num = input(" Remove which # ? ").strip()
+            num = prompt(" Remove which # ? ").strip()
             try:
                 idx = int(num) - 1
                 if 0 <= idx < len(trump_hand):
@@ -698,11 +855,11 @@ def edit_trump_hand(trump_hand: list, available_trumps: set = None) -> list:
             for i, name in enumerate(allowed, 1):
                 print(f"  {i:>2}. {name}")
             if available_trumps is not None:
-                locked = [c for c in UNLOCKABLE if c not in available_trumps]
+                locked = [c for c in _UNLOCKABLE if c not in available_trumps]
                 if locked:
                     print(f"\n  🔒 Locked ({len(locked)}): {', '.join(sorted(locked))}")
             print(f"\n Enter numbers to add (e.g., '1 3 7'), or card names:")
-            raw = input(" > ").strip()
+            raw = prompt(" > ").strip()
             if raw:
                 # Try parsing as numbers first
                 try:
@@ -715,7 +872,13 @@ def edit_trump_hand(trump_hand: list, available_trumps: set = None) -> list:
                     # Try as card names (partial match)
                     for part in raw.split(","):
                         part = part.strip()
-                        matches = [n for n in allowed if part.lower() in n.lower()]
+                        part_folded = _fold_name(part)
+                        # Exact name wins, then prefix, then substring —
+                        # so "shield" picks Shield rather than Shield/Shield+.
+                        matches = [n for low, n in allowed_folded if low == part_folded]
+                        if not matches:
+                            matches = ([n for low, n in allowed_folded if low.startswith(part_folded)]
+                                       or [n for low, n in allowed_folded if part_folded in low])
                         if len(matches) == 1:
                             trump_hand.append(matches[0])
                             print(f"  + {matches[0]}")
@@ -750,29 +913,50 @@ def recommend_trump_play(
     """
     if not trump_hand:
         return []
+    ds_freq = intel.get("trump_behavior", {}).get("Dead Silence", {}).get("freq")
+    return list(_recommend_trump_play(
+        tuple(trump_hand), u_total, o_visible_total, tuple(remaining), target,
+        intel.get("name", ""), tuple(intel.get("trumps", ())), ds_freq,
+        player_hp, opp_behavior, fight_num, mode_key, stay_win_pct,
+    ))
+
+
+@lru_cache(maxsize=128)
+def _recommend_trump_play(
+    trump_hand: tuple,
+    u_total: int,
+    o_visible_total: int,
+    remaining: tuple,
+    target: int,
+    opp_name: str,
+    enemy_trumps: tuple,
+    ds_freq,
+    player_hp: int,
+    opp_behavior: str,
+    fight_num: int,
+    mode_key: str,
+    stay_win_pct,
+) -> tuple:
+    """Memoized core of recommend_trump_play — hashable inputs only, returns a tuple.
+    The advice panel is rebuilt on every redraw of an unchanged round."""
+    weight_of = TRUMP_WEIGHT.get
 
     def get_weight(card_name):
-        return TRUMPS.get(card_name, {}).get("weight", 50)
+        return weight_of(card_name, 50)
 
     recs = []
     hand_set = set(trump_hand)
-    enemy_trumps = set(intel.get("trumps", []))
-    trump_behavior = intel.get("trump_behavior", {})
+    enemy = trump_mask(enemy_trumps)
+    bits = TRUMP_BITS
     gap_to_target = target - u_total if u_total < target else 0
     busted = u_total > target
-    opp_name = intel.get("name", "")
-    is_boss = "Boss" in opp_name or "Undead" in opp_name or "Molded" in opp_name
-    destroys_held = sum(1 for c in trump_hand if c.startswith("Destroy"))
+    is_boss = opp_name in _BOSS_NAMES
+    destroys_held = sum(1 for c in trump_hand if c in _DESTROY_TRUMPS)
     SAVE_THRESHOLD = 60
 
     # ── SMART SUPPRESSION ──
     # Skip trump advice when you're winning comfortably against a weak opponent
-    has_enemy_threats = bool(enemy_trumps & {
-        "Dead Silence", "Black Magic", "Curse", "Escape",
-        "Mind Shift", "Mind Shift+", "Desire", "Desire+",
-        "Shield Assault", "Shield Assault+", "Twenty-One Up",
-        "Oblivion", "Destroy+", "Destroy++"
-    })
+    has_enemy_threats = bool(enemy & _ENEMY_THREAT_MASK)
     needs_advice = (
         busted
         or has_enemy_threats
@@ -783,7 +967,7 @@ def recommend_trump_play(
         or fight_num >= 5
     )
     if not needs_advice:
-        return []
+        return ()
 
     # ── GAUNTLET RESOURCE MANAGEMENT ──
     if mode_key == "3" and fight_num > 0 and not is_boss:
@@ -795,9 +979,9 @@ def recommend_trump_play(
         recs.append("⚠ SAVE Destroy cards — Molded Hoffman (fight #5) needs them!")
 
     if not is_boss:
-        expensive = sorted(set(c for c in trump_hand if get_weight(c) >= SAVE_THRESHOLD), key=get_weight, reverse=True)
+        expensive = heapq.nlargest(3, set(c for c in trump_hand if get_weight(c) >= SAVE_THRESHOLD), key=get_weight)
         if expensive:
-            recs.append(f"SAVE for bosses: {', '.join(expensive[:3])}")
+            recs.append(f"SAVE for bosses: {', '.join(expensive)}")
 
     # ── PRIORITY 1: EMERGENCY — Busted ──
     if busted:
@@ -816,16 +1000,15 @@ def recommend_trump_play(
             for _, msg in fixes:
                 recs.append(f"  {msg}")
         else:
-            shield_cards = [c for c in trump_hand if c.startswith("Shield") and "Assault" not in c]
+            shield_cards = [c for c in trump_hand if c in _SHIELD_TRUMPS]
             if shield_cards:
                 cheapest = min(shield_cards, key=get_weight)
                 recs.append(f"No un-bust cards. Play '{cheapest}' to reduce damage.")
-        return recs
+        return tuple(recs)
 
     # ── PRIORITY 2: REACTIVE — Counter enemy threats ──
-    if "Dead Silence" in enemy_trumps:
-        ds_info = trump_behavior.get("Dead Silence", {})
-        if ds_info.get("freq") in ("very_high", "high"):
+    if enemy & bits["Dead Silence"]:
+        if ds_freq in ("very_high", "high"):
             if destroys_held >= 2:
                 recs.append(f"★ SAVE {destroys_held} Destroys for Dead Silence — he uses it repeatedly!")
             elif destroys_held == 1:
@@ -835,13 +1018,13 @@ def recommend_trump_play(
         elif destroys_held > 0:
             recs.append("SAVE Destroy for Dead Silence if he plays it.")
 
-    if "Black Magic" in enemy_trumps and destroys_held > 0:
-        if "Dead Silence" not in enemy_trumps:
+    if enemy & bits["Black Magic"] and destroys_held > 0:
+        if not enemy & bits["Dead Silence"]:
             recs.append("★ SAVE Destroy for Black Magic — bet +10 = instant death!")
         else:
             recs.append("  Also save a Destroy for Black Magic (bet +10).")
 
-    if "Curse" in enemy_trumps and remaining:
+    if enemy & bits["Curse"] and remaining:
         highest = max(remaining)
         if u_total + highest > target:
             counters = []
@@ -853,24 +1036,27 @@ def recommend_trump_play(
                 counters.sort(key=lambda x: x[0])
                 recs.append(f"If Cursed (forced {highest}, bust to {u_total + highest}): use {counters[0][1]}")
 
-    if "Escape" in enemy_trumps and destroys_held > 0:
+    if enemy & bits["Escape"] and destroys_held > 0:
         recs.append("★ SAVE Destroy for 'Escape' — otherwise wins are voided!")
 
-    if "Mind Shift+" in enemy_trumps:
-        by_weight = sorted(trump_hand, key=get_weight)[:3]
+    # Cheapest trumps to burn against Mind Shift / Desire — shared by both blocks.
+    cheapest3 = heapq.nsmallest(3, trump_hand, key=get_weight)
+
+    if enemy & bits["Mind Shift+"]:
+        by_weight = cheapest3
         recs.append(f"⚠ Mind Shift+: play 3 trumps or lose ALL. Burn: {', '.join(by_weight)}")
-    elif "Mind Shift" in enemy_trumps:
-        by_weight = sorted(trump_hand, key=get_weight)[:2]
+    elif enemy & bits["Mind Shift"]:
+        by_weight = cheapest3[:2]
         recs.append(f"⚠ Mind Shift: play 2 trumps or lose half. Burn: {', '.join(by_weight)}")
 
-    if "Destroy+" in enemy_trumps:
-        bet_ups = [c for c in trump_hand if c.startswith("One-Up") or c.startswith("Two-Up")]
+    if enemy & bits["Destroy+"]:
+        bet_ups = [c for c in trump_hand if c in _BET_UP_TRUMPS]
         if len(bet_ups) > 1:
             recs.append("Don't stack all bet-ups — enemy has Destroy+ to wipe them.")
 
-    if "Desire" in enemy_trumps or "Desire+" in enemy_trumps:
-        d_type = "Desire+" if "Desire+" in enemy_trumps else "Desire"
-        by_weight = sorted(trump_hand, key=get_weight)[:2]
+    if enemy & (bits["Desire"] | bits["Desire+"]):
+        d_type = "Desire+" if enemy & bits["Desire+"] else "Desire"
+        by_weight = cheapest3[:2]
         recs.append(f"⚠ {d_type}: dump cheap trumps to lower your bet. Burn: {', '.join(by_weight)}")
 
     # ── PRIORITY 3: PROACTIVE — Offensive ──
@@ -887,7 +1073,7 @@ def recommend_trump_play(
 
     if gap_to_target > 0:
         draw_options = sorted(
-            [(get_weight(c), c) for c in ["Perfect Draw", "Perfect Draw+", "Ultimate Draw"] if c in hand_set],
+            [(get_weight(c), c) for c in _DRAW_CARDS if c in hand_set],
             key=lambda x: x[0]
         )
         if draw_options:
@@ -896,9 +1082,8 @@ def recommend_trump_play(
                 recs.append(f"  (Save '{draw_options[-1][1]}' for bosses — use cheapest draw first.)")
 
     num_draws = []
-    for card_name in ["2 Card", "3 Card", "4 Card", "5 Card", "6 Card", "7 Card"]:
+    for card_name, needed in _NUM_CARDS:
         if card_name in hand_set:
-            needed = int(card_name[0])
             if u_total + needed == target and needed in remaining:
                 num_draws.append((get_weight(card_name), f"★ '{card_name}' gives you exactly {target}!"))
             elif u_total + needed <= target and needed in remaining:
@@ -914,7 +1099,7 @@ def recommend_trump_play(
 
     # ── PRIORITY 4: DEFENSIVE ──
     if player_hp <= 3:
-        shield_cards = [c for c in trump_hand if c.startswith("Shield") and "Assault" not in c]
+        shield_cards = [c for c in trump_hand if c in _SHIELD_TRUMPS]
         if shield_cards:
             cheapest = min(shield_cards, key=get_weight)
             recs.append(f"LOW HP ({player_hp}) — play '{cheapest}' to reduce damage.")
@@ -927,10 +1112,109 @@ def recommend_trump_play(
     elif "Trump Switch" in hand_set and len(trump_hand) <= 2:
         recs.append("'Trump Switch' — discard 2, draw 3.")
 
-    if not recs:
-        return []
+    return tuple(recs)
+
+
+# Per-trump effect handlers for apply_trump_effect. Each takes the result dict
+# (initially holding the caller's lists), copies any list before mutating it,
+# and fills in "msg". Early returns leave the state untouched.
+def _trump_return(result: dict, trump_name: str, target: int) -> None:
+    if not result["u_hand"] or len(result["u_hand"]) < 2:
+        result["msg"] = "Can't Return — need at least 2 cards in hand."
+        return
+    result["u_hand"] = list(result["u_hand"])
+    result["remaining"] = list(result["remaining"])
+    returned = result["u_hand"].pop()
+    result["remaining"].append(returned)
+    result["remaining"].sort()
+    result["msg"] = f"Returned card {returned} to the deck. Your hand: {result['u_hand']}, total: {sum(result['u_hand'])}"
+
+
+def _trump_remove(result: dict, trump_name: str, target: int) -> None:
+    if not result["o_vis"]:
+        result["msg"] = "Can't Remove — no visible opponent cards."
+        return
+    result["o_vis"] = list(result["o_vis"])
+    removed = result["o_vis"].pop()
+    result["dead_cards"] = merge_dead_cards(result["dead_cards"], (removed,))
+    result["msg"] = f"Removed opponent's card {removed}. Opponent visible: {result['o_vis']}, total: {sum(result['o_vis'])}"
+
+
+def _trump_exchange(result: dict, trump_name: str, target: int) -> None:
+    if not result["u_hand"] or not result["o_vis"]:
+        result["msg"] = "Can't Exchange — both sides need at least one card."
+        return
+    result["u_hand"] = list(result["u_hand"])
+    result["o_vis"] = list(result["o_vis"])
+    your_card = result["u_hand"].pop()
+    opp_card = result["o_vis"].pop()
+    result["u_hand"].append(opp_card)
+    result["o_vis"].append(your_card)
+    result["msg"] = (
+        f"Exchanged: gave your {your_card}, took their {opp_card}. "
+        f"Your hand: {result['u_hand']} (total {sum(result['u_hand'])}), "
+        f"Opponent: {result['o_vis']} (total {sum(result['o_vis'])})"
+    )
+
+
+def _trump_perfect_draw(result: dict, trump_name: str, target: int) -> None:
+    if not result["remaining"]:
+        result["msg"] = "No cards left to draw!"
+        return
+    result["u_hand"] = list(result["u_hand"])
+    result["remaining"] = list(result["remaining"])
+    needed = target - sum(result["u_hand"])
+    if needed in result["remaining"]:
+        result["u_hand"].append(needed)
+        result["remaining"].remove(needed)
+        result["msg"] = f"Perfect Draw! Drew {needed} → total {sum(result['u_hand'])} = {target}!"
+    else:
+        # Draws the closest card to what's needed
+        best = min(result["remaining"], key=lambda c: abs(c - needed))
+        result["u_hand"].append(best)
+        result["remaining"].remove(best)
+        result["msg"] = f"Perfect Draw: needed {needed} but drew {best}. Total: {sum(result['u_hand'])}"
+
+
+def _trump_go_for(result: dict, trump_name: str, target: int) -> None:
+    new_target = int(trump_name.split()[-1])
+    result["target"] = new_target
+    result["msg"] = f"Target changed to {new_target}!"
+
+
+def _trump_love_your_enemy(result: dict, trump_name: str, target: int) -> None:
+    if result["remaining"]:
+        # Opponent draws a random card — we'll ask what they drew
+        result["msg"] = "FORCE_DRAW"  # Signal to caller to ask for drawn card
+    else:
+        result["msg"] = "No cards left for opponent to draw!"
+
+
+def _trump_destroy(result: dict, trump_name: str, target: int) -> None:
+    result["msg"] = "Destroyed opponent's last trump card. (No card state change needed.)"
+
 
-    return recs
+def _trump_destroy_all(result: dict, trump_name: str, target: int) -> None:
+    result["msg"] = "Destroyed ALL opponent trump cards on the table."
+
+
+def _trump_no_card_effect(result: dict, trump_name: str, target: int) -> None:
+    result["msg"] = f"'{trump_name}' played. (Effect is trump-only, no card state change.)"
+
+
+_TRUMP_HANDLERS = MappingProxyType({
+    "Return": _trump_return,
+    "Remove": _trump_remove,
+    "Exchange": _trump_exchange,
+    "Perfect Draw": _trump_perfect_draw,
+    "Go for 17": _trump_go_for,
+    "Go for 24": _trump_go_for,
+    "Go for 27": _trump_go_for,
+    "Love Your Enemy": _trump_love_your_enemy,
+    "Destroy": _trump_destroy,
+    "Destroy+": _trump_destroy_all,
+    "Destroy++": _trump_destroy_all,
+})
 
 
 def apply_trump_effect(
@@ -944,194 +1228,162 @@ def apply_trump_effect(
     """
     Apply a trump card's mechanical effect to the game state.
     Returns dict with updated state and a description of what happened.
+    Lists are copied only when the effect changes them; untouched fields
+    are the caller's own lists, so treat the result as read-only.
     """
     result = {
-        "u_hand": list(u_hand),
-        "o_vis": list(o_vis),
-        "remaining": list(remaining),
-        "dead_cards": list(dead_cards),
+        "u_hand": u_hand,
+        "o_vis": o_vis,
+        "remaining": remaining,
+        "dead_cards": dead_cards,
         "target": target,
         "msg": "",
     }
+    _TRUMP_HANDLERS.get(trump_name, _trump_no_card_effect)(result, trump_name, target)
+    return result
 
-    if trump_name == "Return":
-        if not result["u_hand"] or len(result["u_hand"]) < 2:
-            result["msg"] = "Can't Return — need at least 2 cards in hand."
-            return result
-        returned = result["u_hand"].pop()
-        result["remaining"].append(returned)
-        result["remaining"].sort()
-        result["msg"] = f"Returned card {returned} to the deck. Your hand: {result['u_hand']}, total: {sum(result['u_hand'])}"
-
-    elif trump_name == "Remove":
-        if not result["o_vis"]:
-            result["msg"] = "Can't Remove — no visible opponent cards."
-            return result
-        removed = result["o_vis"].pop()
-        result["dead_cards"].append(removed)
-        result["dead_cards"] = sorted(set(result["dead_cards"]))
-        result["msg"] = f"Removed opponent's card {removed}. Opponent visible: {result['o_vis']}, total: {sum(result['o_vis'])}"
-
-    elif trump_name == "Exchange":
-        if not result["u_hand"] or not result["o_vis"]:
-            result["msg"] = "Can't Exchange — both sides need at least one card."
-            return result
-        your_card = result["u_hand"].pop()
-        opp_card = result["o_vis"].pop()
-        result["u_hand"].append(opp_card)
-        result["o_vis"].append(your_card)
-        result["msg"] = (
-            f"Exchanged: gave your {your_card}, took their {opp_card}. "
-            f"Your hand: {result['u_hand']} (total {sum(result['u_hand'])}), "
-            f"Opponent: {result['o_vis']} (total {sum(result['o_vis'])})"
-        )
+# ============================================================
+# DISPLAY HELPERS
+# ============================================================
+_ANSI_RE = re.compile(r'\033\[[0-9;]*m')
+# hp_bar() slices these instead of repeating characters on every call.
+_BAR_FULL = "█" * 64
+_BAR_EMPTY = "░" * 64
 
-    elif trump_name == "Perfect Draw":
-        needed = target - sum(result["u_hand"])
-        if needed in result["remaining"]:
-            result["u_hand"].append(needed)
-            result["remaining"].remove(needed)
-            result["msg"] = f"Perfect Draw! Drew {needed} → total {sum(result['u_hand'])} = {target}!"
-        else:
-            # Draws the closest card to what's needed
-            if result["remaining"]:
-                best = min(result["remaining"], key=lambda c: abs(c - needed))
-                result["u_hand"].append(best)
-                result["remaining"].remove(best)
-                result["msg"] = f"Perfect Draw: needed {needed} but drew {best}. Total: {sum(result['u_hand'])}"
-            else:
-                result["msg"] = "No cards left to draw!"
 
-    elif trump_name in ("Go for 17", "Go for 24", "Go for 27"):
-        new_target = int(trump_name.split()[-1])
-        result["target"] = new_target
-        result["msg"] = f"Target changed to {new_target}!"
+def emit(*lines: str) -> None:
+    """Write several lines to stdout in one call (one write instead of a print per line)."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
-    elif trump_name == "Love Your Enemy":
-        if result["remaining"]:
-            # Opponent draws a random card — we'll ask what they drew
-            result["msg"] = "FORCE_DRAW"  # Signal to caller to ask for drawn card
-        else:
-            result["msg"] = "No cards left for opponent to draw!"
 
-    elif trump_name == "Destroy":
-        result["msg"] = "Destroyed opponent's last trump card. (No card state change needed.)"
+def prompt(msg: str) -> str:
+    """Read one line of user input. Every prompt goes through here, so
+    scripted playthroughs or another front end only need to swap this."""
+    return input(msg)
 
-    elif trump_name in ("Destroy+", "Destroy++"):
-        result["msg"] = "Destroyed ALL opponent trump cards on the table."
 
-    else:
-        result["msg"] = f"'{trump_name}' played. (Effect is trump-only, no card state change.)"
+def clear_screen() -> None:
+    """Clear the terminal and home the cursor with ANSI escapes (no shell subprocess)."""
+    sys.stdout.write("\033[2J\033[H")
+    sys.stdout.flush()
 
-    return result
 
-# ============================================================
-# DISPLAY HELPERS
-# ============================================================
-def clear_screen() -> None:
-    os.system("cls" if os.name == "nt" else "clear")
+@lru_cache(maxsize=64)
+def _render_header(title: str, width: int) -> str:
+    """Banner text for print_header(); the same menus re-print the same headers."""
+    rule = "=" * width
+    return "\n".join(("\n" + rule, f" {title}".center(width), rule))
 
 
 def print_header(title: str, width: int = 60) -> None:
-    print("\n" + "=" * width)
-    print(f" {title}".center(width))
-    print("=" * width)
+    emit(_render_header(title, width))
 
 
+@lru_cache(maxsize=256)
 def hp_bar(current: int, maximum: int, width: int = 20) -> str:
-    """Render an ASCII HP bar."""
+    """Render an ASCII HP bar (memoized — HP values only span a few dozen states)."""
     if maximum <= 0:
         return "[?] 0/0 (0%)"
-    filled = int((current / maximum) * width)
-    empty = width - filled
+    filled = max(0, min(width, (current * width) // maximum))
     pct = (current / maximum) * 100
-    return f"[{'█' * filled}{'░' * empty}] {current}/{maximum} ({pct:.0f}%)"
+    return f"[{_BAR_FULL[:filled]}{_BAR_EMPTY[:width - filled]}] {current}/{maximum} ({pct:.0f}%)"
 
 
 def display_hp_status(player_hp: int, player_max: int, opp_hp: int, opp_max: int, opp_name: str) -> None:
     """Show both HP bars."""
     name_short = opp_name[:25]  # Allow longer names
-    print()
-    print(" ┌───────────────────────────────────────────────────────────┐")
-    print(f" │ {'HP STATUS':^59s} │")
-    print(" ├───────────────────────────────────────────────────────────┤")
     player_bar = hp_bar(player_hp, player_max, 15)
     opp_bar = hp_bar(opp_hp, opp_max, 15)
-    print(f" │ YOU: {player_bar:<54s}│")
-    print(f" │ {name_short:<25s} {opp_bar:<33s}│")
-    print(" └───────────────────────────────────────────────────────────┘")
+    emit(
+        "",
+        " ┌───────────────────────────────────────────────────────────┐",
+        f" │ {'HP STATUS':^59s} │",
+        " ├───────────────────────────────────────────────────────────┤",
+        f" │ YOU: {player_bar:<54s}│",
+        f" │ {name_short:<25s} {opp_bar:<33s}│",
+        " └───────────────────────────────────────────────────────────┘",
+    )
+
+
+# Deck tracker cell per card, indexed [card][accounted]: green IN / red OUT.
+_MATRIX_CELLS = tuple(
+    (f"\033[92m{i:>2}:IN \033[0m", f"\033[91m{i:>2}:OUT\033[0m") for i in range(12)
+)
 
 
 def display_card_matrix(accounted_for) -> None:
     """Show which cards (1–11) are in/out of the deck."""
     accounted_set = set(accounted_for)
-    print("\n ┌" + "─" * 46 + "┐")
-    print(" │" + " DECK TRACKER ".center(46) + "│")
-    print(" ├" + "─" * 46 + "┤")
+    cells = [_MATRIX_CELLS[i][i in accounted_set] for i in ALL_CARDS]
+    remaining = [c for c in ALL_CARDS if c not in accounted_set]
+    emit(
+        "\n ┌" + "─" * 46 + "┐",
+        " │" + " DECK TRACKER ".center(46) + "│",
+        " ├" + "─" * 46 + "┤",
+        " │ " + " ".join(cells[:6]) + " │",
+        " │ " + " ".join(cells[6:]) + " │",
+        " └" + "─" * 46 + "┘",
+        f" Cards remaining: {len(remaining)} | Sum available: {sum(remaining)}",
+    )
 
-    def fmt(i: int) -> str:
-        if i in accounted_set:
-            return f"\033[91m{i:>2}:OUT\033[0m"
-        return f"\033[92m{i:>2}:IN \033[0m"
 
-    line1 = " │ " + " ".join(fmt(i) for i in range(1, 7)) + " │"
-    line2 = " │ " + " ".join(fmt(i) for i in range(7, 12)) + " │"
-    print(line1)
-    print(line2)
-    print(" └" + "─" * 46 + "┘")
+def _render_trumps_reference() -> str:
+    """Render the trump reference body (grouped by category) as one string."""
+    lines = []
+    current_cat = None
+    for name, cat, desc in zip(TRUMP_NAMES, TRUMP_CATS, TRUMP_DESCS):
+        if cat != current_cat:
+            current_cat = cat
+            lines.append(f"\n --- {current_cat.upper()} ---")
+        lines.append(f" {name:<20s} {desc}")
+    return "\n".join(lines) + "\n\n"
+
 
-    remaining = [c for c in range(1, 12) if c not in accounted_set]
-    print(f" Cards remaining: {len(remaining)} | Sum available: {sum(remaining)}")
+# TRUMPS is frozen, so the reference only needs rendering once.
+_TRUMPS_REFERENCE = _render_trumps_reference()
 
 
 def display_trumps_reference() -> None:
     """Print full trump card reference."""
     print_header("TRUMP CARD REFERENCE")
-    current_cat = None
-    for name, info in TRUMPS.items():
-        cat = info.get("cat", "Other")
-        if cat != current_cat:
-            current_cat = cat
-            print(f"\n --- {current_cat.upper()} ---")
-        print(f" {name:<20s} {info.get('desc','')}")
-    print()
+    sys.stdout.write(_TRUMPS_REFERENCE)
 
 
 def display_opponent_info(intel: dict) -> None:
     """Print detailed opponent info with standard and special trump sections."""
-    print(f"\n ┌─ TARGET: {intel['name']}")
-    print(f" │ Mode: {intel.get('mode','?')}")
-    print(f" │ AI Type: {intel.get('ai','?')}")
+    lines = [
+        f"\n ┌─ TARGET: {intel['name']}",
+        f" │ Mode: {intel.get('mode','?')}",
+        f" │ AI Type: {intel.get('ai','?')}",
+    ]
 
     # Standard trumps (common cards any opponent might use)
     std_trumps = intel.get("standard_trumps", [])
     special_trumps = intel.get("trumps", [])
 
     if std_trumps:
-        print(f" │ Standard Trumps: {', '.join(std_trumps)}")
+        lines.append(f" │ Standard Trumps: {', '.join(std_trumps)}")
     if special_trumps:
-        print(f" │ \033[96mSpecial Trumps: {', '.join(special_trumps)}\033[0m")
+        lines.append(f" │ \033[96mSpecial Trumps: {', '.join(special_trumps)}\033[0m")
     elif not std_trumps:
-        print(f" │ Trumps: (none observed)")
+        lines.append(" │ Trumps: (none observed)")
 
-    print(f" │ Stays at: {intel.get('stay_val','?')}+")
-    print(f" └─ {intel.get('desc','')}")
+    lines.append(f" │ Stays at: {intel.get('stay_val','?')}+")
+    lines.append(f" └─ {intel.get('desc','')}")
     tip = intel.get("tip", "")
     if tip:
-        print(f"\n INTEL:\n {tip}")
+        lines.append(f"\n INTEL:\n {tip}")
+    emit(*lines)
 
 
-def display_round_history(history) -> None:
-    """Print round history for current opponent."""
-    if not history:
+def display_round_history(history: dict) -> None:
+    """Print round history for current opponent (see new_round_history)."""
+    if not history["round"]:
         print("\n No rounds played yet against this opponent.")
         return
-    print("\n ┌─ ROUND HISTORY ──────────────────────────────────┐")
-    for entry in history:
-        rnd = entry["round"]
-        result = entry["result"]
-        dmg = entry["damage"]
-        who = entry["damage_to"]
+    lines = ["\n ┌─ ROUND HISTORY ──────────────────────────────────┐"]
+    columns = zip(history["round"], history["result"], history["damage"], history["damage_to"])
+    for rnd, result, dmg, who in columns:
         if result == "VOID":
             line = f" │ R{rnd}: VOID (Escape/Oblivion) — no damage"
         elif result == "TIE":
@@ -1140,8 +1392,9 @@ def display_round_history(history) -> None:
             winner = "YOU WON" if result == "WIN" else "YOU LOST"
             target_lbl = "opponent" if who == "opponent" else "you"
             line = f" │ R{rnd}: {winner} → {dmg} dmg to {target_lbl}"
-        print(f"{line:<55s}│")
-    print(" └─────────────────────────────────────────────────┘")
+        lines.append(f"{line:<55s}│")
+    lines.append(" └─────────────────────────────────────────────────┘")
+    emit(*lines)
 
 
 def parse_card_values(raw: str):
@@ -1149,152 +1402,223 @@ def parse_card_values(raw: str):
     if not raw.strip():
         return []
     cards = list(map(int, raw.split()))
+    bad = _first_invalid_card(cards)
+    if bad is not None:
+        raise ValueError(f"Card {bad} is out of range (1-11).")
+    return cards
+
+
+def _first_invalid_card(cards):
+    """Return the first card outside 1–11, or None if every card is valid."""
+    if not cards or (min(cards) >= 1 and max(cards) <= 11):
+        return None
     for c in cards:
         if c < 1 or c > 11:
-            raise ValueError(f"Card {c} is out of range (1-11).")
-    return cards
+            return c
 
 
 # ============================================================
 # SOLVER / PROBABILITY LOGIC
 # ============================================================
+# The fixed 1–11 deck, in ascending order.
+ALL_CARDS = tuple(range(1, 12))
+# Deck bitmasks: bit c set means card c (1–11) is present.
+FULL_DECK_MASK = 0b111111111110
+# _CARDS_UP_TO[k] = mask of cards 1..k — the draws that stay within k points of room.
+_CARDS_UP_TO = tuple(((1 << (k + 1)) - 1) & FULL_DECK_MASK for k in range(12))
+
+
+def mask_from_cards(cards) -> int:
+    """Pack a collection of card values into a bitmask (bit c set for card c)."""
+    mask = 0
+    for c in cards:
+        mask |= 1 << c
+    return mask
+
+
+def cards_from_mask(mask: int) -> tuple:
+    """Unpack a card bitmask into an ascending tuple of card values."""
+    cards = []
+    c = 0
+    while mask:
+        if mask & 1:
+            cards.append(c)
+        mask >>= 1
+        c += 1
+    return tuple(cards)
+
+
+def _build_mask_cards() -> tuple:
+    """cards_from_mask() for every deck mask, each built from the mask minus its top card."""
+    table = [()]
+    for mask in range(1, FULL_DECK_MASK + 1):
+        top = mask.bit_length() - 1
+        table.append(table[mask ^ (1 << top)] + (top,))
+    return tuple(table)
+
+
+# _MASK_CARDS[mask] = cards_from_mask(mask) for every deck mask.
+_MASK_CARDS = _build_mask_cards()
+# Set-bit count for every possible deck mask.
+_POPCOUNT = bytes(map(len, _MASK_CARDS))
+
+
+def merge_dead_cards(dead_cards, new_cards) -> list:
+    """Union new card values into a dead-card list; returns it sorted and deduplicated."""
+    mask = (mask_from_cards(dead_cards) | mask_from_cards(new_cards)) & FULL_DECK_MASK
+    return list(_MASK_CARDS[mask])
+
+
 def calculate_probabilities(remaining, current_total: int, target: int):
     """Return (safe_pct, bust_pct, perfect_draws)."""
     if not remaining:
         return 0.0, 0.0, []
-    safe_draws = [c for c in remaining if current_total + c <= target]
-    bust_draws = [c for c in remaining if current_total + c > target]
-    perfect_draws = [c for c in remaining if current_total + c == target]
-    total_cards = len(remaining)
-    safe_pct = (len(safe_draws) / total_cards) * 100
-    bust_pct = (len(bust_draws) / total_cards) * 100
+    mask = mask_from_cards(remaining)
+    room = target - current_total
+    total_cards = _POPCOUNT[mask]
+    safe_count = _POPCOUNT[mask & _CARDS_UP_TO[min(max(room, 0), 11)]]
+    perfect_draws = [room] if 1 <= room <= 11 and mask >> room & 1 else []
+    safe_pct = (safe_count / total_cards) * 100
+    bust_pct = ((total_cards - safe_count) / total_cards) * 100
     return safe_pct, bust_pct, perfect_draws
 
 
-def resolve_round_outcome(your_total: int, opp_total: int, target: int) -> str:
-    """Resolve winner from final totals using RE7 21 bust rules."""
-    you_bust = your_total > target
-    opp_bust = opp_total > target
+# Probabilities closer than this are treated as equal when ranking options.
+_PROB_EPS = 1e-9
 
-    if not you_bust and not opp_bust:
-        if your_total > opp_total:
-            return "WIN"
-        if your_total < opp_total:
-            return "LOSS"
-        return "TIE"
 
-    if you_bust and not opp_bust:
-        return "LOSS"
-    if not you_bust and opp_bust:
-        return "WIN"
+def _opp_dist_kernel(o_total: int, deck_mask: int, stay_val: int, target: int,
+                     overshoot_chance: float) -> dict:
+    """
+    Hit-to-threshold DP behind _opp_dist_threshold().
 
-    # both bust -> smaller bust margin wins
-    your_over = your_total - target
-    opp_over = opp_total - target
-    if your_over < opp_over:
-        return "WIN"
-    if your_over > opp_over:
-        return "LOSS"
-    return "TIE"
+    Runs forward over (total, deck_mask) states one draw at a time, so every
+    draw order that reaches the same total with the same cards left is
+    merged into a single state before it is expanded.
+    """
+    # Locals for the hot loop (avoid repeated global lookups per state)
+    popcount = _POPCOUNT
+    mask_cards = _MASK_CARDS
+    stay_chance = 1.0 - overshoot_chance
+    # Per-card share of the gamble draw, by number of cards left (1–11)
+    gamble_share = [0.0] + [overshoot_chance / n for n in range(1, 12)]
+    result = {}
+    frontier = {(o_total, deck_mask): 1.0}
+    while frontier:
+        next_frontier = {}
+        for (total, mask), prob in frontier.items():
+            if total < stay_val and mask and total <= target:
+                # Still under threshold: draw uniformly from what is left
+                p = prob / popcount[mask]
+                for card in mask_cards[mask]:
+                    state = (total + card, mask ^ (1 << card))
+                    next_frontier[state] = next_frontier.get(state, 0.0) + p
+                continue
+
+            if total >= stay_val and mask and total < target:
+                # Blend: opponent MIGHT draw one more even past threshold
+                # Chance they stay
+                result[total] = result.get(total, 0.0) + prob * stay_chance
+                # Chance they gamble and draw one more
+                p = prob * gamble_share[popcount[mask]]
+                for card in mask_cards[mask]:
+                    result[total + card] = result.get(total + card, 0.0) + p
+            else:
+                # Bust, or stopped with nothing left to gamble on
+                result[total] = result.get(total, 0.0) + prob
+        frontier = next_frontier
+    return result
 
 
-def opponent_total_distribution(o_visible_total: int, remaining, stay_val: int, target: int, behavior: str = "auto"):
+@lru_cache(maxsize=4096)
+def _opp_dist_cached(o_visible_total: int, deck_mask: int, stay_val: int, target: int, behavior: str) -> tuple:
     """
-    Return probability distribution of opponent final totals.
+    Probability distribution of opponent final totals, as an immutable
+    tuple of (total, probability) pairs.
 
-    behavior options:
+    behavior options (already lower-cased and stripped):
       - stay: opponent does not draw (confirmed)
       - hit_once: opponent draws one card then stops
       - auto / hit_to_threshold: opponent hits until reaching stay_val or bust,
         BUT blends in uncertainty (30% chance of drawing one more past threshold)
         because we're guessing — the real AI may be more aggressive.
+
+    Keyed on the deck bitmask so re-analyzing the same position is a cache hit.
     """
-    behavior = behavior.lower().strip()
-    deck = tuple(sorted(set(remaining)))
+    handler = _OPP_DIST_BY_BEHAVIOR.get(behavior, _opp_dist_draw_out)
+    return handler(o_visible_total, deck_mask, stay_val, target)
 
-    if behavior == "stay":
-        # Opponent stopped drawing. They have a hidden card we can't see.
-        # Their total = visible total + one unknown card from the remaining deck.
-        if not deck:
-            return {o_visible_total: 1.0}
-        p = 1.0 / len(deck)
-        return {o_visible_total + c: p for c in deck}
 
+def _opp_dist_stay(o_visible_total: int, deck_mask: int, stay_val: int, target: int) -> tuple:
+    """Opponent stopped drawing: visible total + one hidden card from the deck."""
+    deck = _MASK_CARDS[deck_mask]
+    if not deck:
+        return ((o_visible_total, 1.0),)
+    p = 1.0 / len(deck)
+    return tuple((o_visible_total + c, p) for c in deck)
+
+
+def _opp_dist_hit_once(o_visible_total: int, deck_mask: int, stay_val: int, target: int) -> tuple:
+    """Opponent draws exactly one more card (unless already bust)."""
     if o_visible_total > target:
-        return {o_visible_total: 1.0}
+        return ((o_visible_total, 1.0),)
+    return _opp_dist_stay(o_visible_total, deck_mask, stay_val, target)
 
-    if behavior == "hit_once":
-        if not deck:
-            return {o_visible_total: 1.0}
-        p = 1.0 / len(deck)
-        return {o_visible_total + c: p for c in deck}
 
-    memo = {}
+def _overshoot_chance(o_visible_total: int, target: int) -> float:
+    """Chance the AI gambles on one more draw after reaching its threshold."""
     # How far below target the opponent is — more room = more likely they draw again
     gap_to_target = max(0, target - o_visible_total)
     # Uncertainty: 30% base chance of drawing past threshold, higher if far from target
-    overshoot_chance = min(0.50, 0.15 + (gap_to_target / target) * 0.35)
-
-    def _merge(dest: dict, src: dict, weight: float) -> None:
-        for total, prob in src.items():
-            dest[total] = dest.get(total, 0.0) + (prob * weight)
-
-    def _dfs(total: int, deck_state: tuple):
-        key = (total, deck_state)
-        if key in memo:
-            return memo[key]
-
-        if total > target:
-            memo[key] = {total: 1.0}
-            return memo[key]
-
-        if behavior in ("auto", "hit_to_threshold"):
-            if total >= stay_val or not deck_state:
-                if total >= stay_val and deck_state and total < target:
-                    # Blend: opponent MIGHT draw one more even past threshold
-                    dist = {}
-                    # Chance they stay
-                    _merge(dist, {total: 1.0}, 1.0 - overshoot_chance)
-                    # Chance they gamble and draw one more
-                    n = len(deck_state)
-                    for idx, card in enumerate(deck_state):
-                        next_total = total + card
-                        _merge(dist, {next_total: 1.0}, overshoot_chance / n)
-                    memo[key] = dist
-                    return dist
-                memo[key] = {total: 1.0}
-                return memo[key]
-
-        if not deck_state:
-            memo[key] = {total: 1.0}
-            return memo[key]
-
-        dist = {}
-        n = len(deck_state)
-        for idx, card in enumerate(deck_state):
-            next_total = total + card
-            next_deck = deck_state[:idx] + deck_state[idx + 1 :]
-            sub = _dfs(next_total, next_deck)
-            _merge(dist, sub, 1.0 / n)
-
-        memo[key] = dist
-        return dist
-
-    return _dfs(o_visible_total, deck)
-
-
-def outcome_probabilities(your_total: int, opp_dist: dict, target: int):
-    """Map opponent total distribution to WIN/TIE/LOSS probabilities."""
-    probs = {"win": 0.0, "tie": 0.0, "loss": 0.0}
-    for opp_total, p in opp_dist.items():
-        result = resolve_round_outcome(your_total, opp_total, target)
-        if result == "WIN":
-            probs["win"] += p
-        elif result == "TIE":
-            probs["tie"] += p
-        else:
-            probs["loss"] += p
-    return probs
+    return min(0.50, 0.15 + (gap_to_target / target) * 0.35)
+
+
+def _opp_dist_threshold(o_visible_total: int, deck_mask: int, stay_val: int, target: int) -> tuple:
+    """Opponent hits until stay_val, with a blended chance of one extra draw."""
+    if o_visible_total > target:
+        return ((o_visible_total, 1.0),)
+    overshoot_chance = _overshoot_chance(o_visible_total, target)
+    dist = _opp_dist_kernel(o_visible_total, deck_mask, stay_val, target, overshoot_chance)
+    return tuple(dist.items())
+
+
+def _opp_dist_draw_out(o_visible_total: int, deck_mask: int, stay_val: int, target: int) -> tuple:
+    """Unknown behaviour: opponent keeps drawing until bust or deck empty."""
+    return _opp_dist_threshold(o_visible_total, deck_mask, target + 1, target)
+
+
+# Normalized behaviour → distribution model. Anything else draws out the deck.
+_OPP_DIST_BY_BEHAVIOR = {
+    "stay": _opp_dist_stay,
+    "hit_once": _opp_dist_hit_once,
+    "auto": _opp_dist_threshold,
+    "hit_to_threshold": _opp_dist_threshold,
+}
+
+
+def _outcome_from_pairs(your_total: int, opp_pairs, target: int) -> dict:
+    """Map (total, prob) pairs, e.g. straight from the solver cache, to WIN/TIE/LOSS probabilities."""
+    # RE7 21 bust rules with your side fixed reduce to two comparisons:
+    #   you safe → win if opp is lower or bust; you bust → win only if opp
+    #   overshoots further (higher total). Equal totals always tie.
+    win = tie = loss = 0.0
+    if your_total <= target:
+        for opp_total, p in opp_pairs:
+            if opp_total < your_total or opp_total > target:
+                win += p
+            elif opp_total == your_total:
+                tie += p
+            else:
+                loss += p
+    else:
+        for opp_total, p in opp_pairs:
+            if opp_total > your_total:
+                win += p
+            elif opp_total == your_total:
+                tie += p
+            else:
+                loss += p
+    return {"win": win, "tie": tie, "loss": loss}
 
 
 def evaluate_stay_hit_outcomes(
@@ -1306,10 +1630,10 @@ def evaluate_stay_hit_outcomes(
     opp_behavior: str,
 ):
     """Compute expected outcome probs for staying now vs. hitting now."""
-    stay_opp_dist = opponent_total_distribution(
-        o_visible_total, remaining, stay_val, target, behavior=opp_behavior
-    )
-    stay_probs = outcome_probabilities(u_total, stay_opp_dist, target)
+    behavior = opp_behavior.lower().strip()
+    deck_mask = mask_from_cards(remaining)
+    stay_opp_dist = _opp_dist_cached(o_visible_total, deck_mask, stay_val, target, behavior)
+    stay_probs = _outcome_from_pairs(u_total, stay_opp_dist, target)
 
     if not remaining:
         return stay_probs, {"win": 0.0, "tie": 0.0, "loss": 1.0}
@@ -1319,11 +1643,10 @@ def evaluate_stay_hit_outcomes(
 
     for card in remaining:
         your_new_total = u_total + card
-        next_remaining = [c for c in remaining if c != card]
-        opp_dist_after_hit = opponent_total_distribution(
-            o_visible_total, next_remaining, stay_val, target, behavior=opp_behavior
+        opp_dist_after_hit = _opp_dist_cached(
+            o_visible_total, deck_mask & ~(1 << card), stay_val, target, behavior
         )
-        draw_outcome = outcome_probabilities(your_new_total, opp_dist_after_hit, target)
+        draw_outcome = _outcome_from_pairs(your_new_total, opp_dist_after_hit, target)
         hit_probs["win"] += draw_outcome["win"] * draw_weight
         hit_probs["tie"] += draw_outcome["tie"] * draw_weight
         hit_probs["loss"] += draw_outcome["loss"] * draw_weight
@@ -1350,28 +1673,66 @@ def evaluate_bust_inline(u_total: int, o_visible_total: int, remaining, stay_val
 
     best_card = None
     best_win = 0.0
+    behavior = behavior.lower().strip()
+    deck_mask = mask_from_cards(remaining)
 
     for draw_card in bust_cards:
         bust_total = u_total + draw_card
-        deck_after = [c for c in remaining if c != draw_card]
 
         # Model opponent's final total distribution
-        opp_dist = opponent_total_distribution(o_visible_total, deck_after, stay_val, target, behavior)
+        opp_dist = _opp_dist_cached(o_visible_total, deck_mask & ~(1 << draw_card), stay_val, target, behavior)
 
-        # Use bust_outcome logic: both bust → closest to target wins
-        wins = 0.0
-        for opp_total, prob in opp_dist.items():
-            result = bust_outcome(bust_total, opp_total, target)
-            if result == "WIN":
-                wins += prob
+        # Same as bust_outcome: both bust → closest to target wins
+        wins = _outcome_from_pairs(bust_total, opp_dist, target)["win"]
 
-        if wins > best_win:
+        # Tolerance keeps exact ties on the lowest card despite float rounding
+        if wins > best_win + _PROB_EPS:
             best_win = wins
             best_card = draw_card
 
     return {"best_card": best_card, "bust_total": u_total + best_card if best_card else 0, "win_pct": best_win}
 
 
+_PROB_KEYS = ("win", "tie", "loss")
+
+
+@lru_cache(maxsize=4096)
+def _solver_core(u_total: int, o_visible_total: int, deck_mask: int, stay_val: int, target: int,
+                 behavior_key: str, with_force: bool) -> tuple:
+    """
+    Solver numbers behind generate_advice(), memoized on the game state.
+    Returns (stay, hit, force, opp_bust_count) with each outcome as a
+    (win, tie, loss) tuple; force is None unless with_force is set.
+    """
+    remaining = cards_from_mask(deck_mask)
+    stay_probs, hit_probs = evaluate_stay_hit_outcomes(
+        u_total, o_visible_total, remaining, stay_val, target, behavior_key
+    )
+    stay = tuple(stay_probs[k] for k in _PROB_KEYS)
+    hit = tuple(hit_probs[k] for k in _PROB_KEYS)
+    if not with_force:
+        return stay, hit, None, 0
+
+    force_probs = {"win": 0.0, "tie": 0.0, "loss": 0.0}
+    card_weight = 1.0 / len(remaining)
+    opp_bust_count = 0
+
+    for forced_card in remaining:
+        new_opp_total = o_visible_total + forced_card
+        if new_opp_total > target:
+            opp_bust_count += 1
+        # After forced draw, opponent continues with normal AI
+        opp_dist = _opp_dist_cached(
+            new_opp_total, deck_mask & ~(1 << forced_card), stay_val, target, "auto"
+        )
+        outcome = _outcome_from_pairs(u_total, opp_dist, target)
+        force_probs["win"] += outcome["win"] * card_weight
+        force_probs["tie"] += outcome["tie"] * card_weight
+        force_probs["loss"] += outcome["loss"] * card_weight
+
+    return stay, hit, tuple(force_probs[k] for k in _PROB_KEYS), opp_bust_count
+
+
 def generate_advice(
     u_total: int,
     o_visible_total: int,
@@ -1413,9 +1774,10 @@ def generate_advice(
         advice_lines.append(f"★ OPPONENT LOW ({opp_hp}/{opp_max}) — consider stacking bet-ups to finish them.")
 
     # ── Opponent-specific warnings ──
-    trumps = set(intel.get("trumps", []))
+    trumps = trump_mask(tuple(intel.get("trumps", ())))
+    bits = TRUMP_BITS
 
-    if "Curse" in trumps and remaining:
+    if trumps & bits["Curse"] and remaining:
         highest_card = max(remaining)
         forced_total = u_total + highest_card
         if forced_total > target:
@@ -1429,48 +1791,48 @@ def generate_advice(
                 f"Curse check: Highest remaining = {highest_card}. Forced total = {forced_total} — survivable."
             )
 
-    if "Twenty-One Up" in trumps and remaining:
+    if trumps & bits["Twenty-One Up"] and remaining:
         cards_giving_21 = [c for c in remaining if o_visible_total + c == 21]
         if cards_giving_21:
             priority_warnings.append(
                 "!! INSTANT KILL RISK !! He can hit EXACTLY 21 by drawing: "
-                f"{sorted(cards_giving_21)}.\n"
+                f"{cards_giving_21}.\n"
                 "'Twenty-One Up' sets bet to 21 — keep 'Destroy' ready."
             )
 
-    if "Dead Silence" in trumps:
+    if trumps & bits["Dead Silence"]:
         if u_total < 17:
             priority_warnings.append(
                 f"!! DEAD SILENCE RISK !! If locked at {u_total}, you likely lose.\n"
                 "COUNTER: Priority-destroy Dead Silence. Consider drawing before he can play it."
             )
 
-    if "Escape" in trumps:
+    if trumps & bits["Escape"]:
         advice_lines.append("ESCAPE: He may void the round if losing. Destroy it or stack bets to one-shot.")
 
-    if "Mind Shift" in trumps or "Mind Shift+" in trumps:
-        ms_type = "Mind Shift+" if "Mind Shift+" in trumps else "Mind Shift"
-        ms_effect = "ALL your trumps" if "Mind Shift+" in trumps else "half your trumps"
+    if trumps & (bits["Mind Shift"] | bits["Mind Shift+"]):
+        ms_type = "Mind Shift+" if trumps & bits["Mind Shift+"] else "Mind Shift"
+        ms_effect = "ALL your trumps" if trumps & bits["Mind Shift+"] else "half your trumps"
         advice_lines.append(f"{ms_type}: Can take {ms_effect}. Play 2+ trumps per turn to block, or Destroy it.")
 
-    if "Desire" in trumps or "Desire+" in trumps:
-        d_type = "Desire+" if "Desire+" in trumps else "Desire"
-        d_effect = "full trump count" if "Desire+" in trumps else "half trump count"
+    if trumps & (bits["Desire"] | bits["Desire+"]):
+        d_type = "Desire+" if trumps & bits["Desire+"] else "Desire"
+        d_effect = "full trump count" if trumps & bits["Desire+"] else "half trump count"
         advice_lines.append(f"{d_type}: Your bet scales with your {d_effect}. Don't hoard trumps.")
 
-    if "Shield Assault" in trumps or "Shield Assault+" in trumps:
+    if trumps & (bits["Shield Assault"] | bits["Shield Assault+"]):
         advice_lines.append("SHIELD ASSAULT: Negates your damage AND hurts you. Stack bet-ups to overwhelm.")
 
-    if "Go for 17" in trumps:
+    if trumps & bits["Go for 17"]:
         advice_lines.append("GO FOR 17: Can change target to 17 — your 20 becomes a bust! Watch for it.")
 
-    if "Ultimate Draw" in trumps or "Perfect Draw+" in trumps:
+    if trumps & (bits["Ultimate Draw"] | bits["Perfect Draw+"]):
         advice_lines.append("ULTIMATE/PERFECT DRAW+: He almost always gets the best possible card. Expect near-perfect hands.")
 
-    if "Destroy+" in trumps or "Destroy++" in trumps:
+    if trumps & (bits["Destroy+"] | bits["Destroy++"]):
         advice_lines.append("DESTROY+/++: Can wipe ALL your trumps at once. Don't over-commit trump cards.")
 
-    if "Oblivion" in trumps:
+    if trumps & bits["Oblivion"]:
         advice_lines.append("OBLIVION: Can void a round. Annoying, not fatal — replay and keep pressure.")
 
     # ── Core draw/stay decision ──
@@ -1502,10 +1864,16 @@ def generate_advice(
             )
         return priority_warnings, advice_lines
 
+    # Force draw analysis (Love Your Enemy) only runs if the player holds it
+    has_lye = "Love Your Enemy" in hand_set
+    with_force = bool(remaining) and behavior_key != "stay" and has_lye
+
     # Outcome model: compare staying now vs hitting now using selected opponent behavior.
-    stay_probs, hit_probs = evaluate_stay_hit_outcomes(
-        u_total, o_visible_total, remaining, stay_val, target, behavior_key
+    stay_t, hit_t, force_t, opp_bust_count = _solver_core(
+        u_total, o_visible_total, mask_from_cards(remaining), stay_val, target, behavior_key, with_force
     )
+    stay_probs = dict(zip(_PROB_KEYS, stay_t))
+    hit_probs = dict(zip(_PROB_KEYS, hit_t))
     bust_pct = 100.0 - safe_pct
     advice_lines.append(f"MODEL: {behavior_label}.")
     if behavior_key == "stay":
@@ -1526,26 +1894,8 @@ def generate_advice(
     # Force draw analysis (Love Your Enemy — only if player holds it)
     force_probs = None
     opp_bust_from_force = 0.0
-    has_lye = "Love Your Enemy" in hand_set
-    if remaining and behavior_key != "stay" and has_lye:
-        force_probs = {"win": 0.0, "tie": 0.0, "loss": 0.0}
-        card_weight = 1.0 / len(remaining)
-        opp_bust_count = 0
-
-        for forced_card in remaining:
-            new_opp_total = o_visible_total + forced_card
-            if new_opp_total > target:
-                opp_bust_count += 1
-            after_remaining = [c for c in remaining if c != forced_card]
-            # After forced draw, opponent continues with normal AI
-            opp_dist = opponent_total_distribution(
-                new_opp_total, after_remaining, stay_val, target, behavior="auto"
-            )
-            outcome = outcome_probabilities(u_total, opp_dist, target)
-            force_probs["win"] += outcome["win"] * card_weight
-            force_probs["tie"] += outcome["tie"] * card_weight
-            force_probs["loss"] += outcome["loss"] * card_weight
-
+    if with_force:
+        force_probs = dict(zip(_PROB_KEYS, force_t))
         opp_bust_from_force = (opp_bust_count / len(remaining)) * 100
         advice_lines.append(
             "If you FORCE A DRAW (Love Your Enemy) -> "
@@ -1604,9 +1954,9 @@ def generate_advice(
     if bust_result and bust_result["win_pct"] >= 0.20:
         options["INTENTIONAL BUST ★ challenge"] = bust_result["win_pct"]
 
-    best_option = max(options, key=options.get)
-    best_win = options[best_option]
-    second_best_win = max(v for k, v in options.items() if k != best_option)
+    # Stable sort keeps the listed order on ties, matching max()
+    (best_option, best_win), (_, second_best_win) = sorted(
+        options.items(), key=lambda kv: kv[1], reverse=True)[:2]
     win_edge = best_win - second_best_win
 
     if win_edge >= 0.15 and not (player_hp <= 3 and safe_pct < 50 and best_option == "HIT"):
@@ -1622,7 +1972,7 @@ def generate_advice(
 
     if perfect_draws and safe_pct >= 50:
         advice_lines.append(
-            f"ACTION: HIT — can reach {target} with {sorted(perfect_draws)}. Safe chance: {safe_pct:.0f}%."
+            f"ACTION: HIT — can reach {target} with {perfect_draws}. Safe chance: {safe_pct:.0f}%."
         )
         return priority_warnings, advice_lines
 
@@ -1766,6 +2116,20 @@ def evaluate_bust_challenge(u_total: int, o_visible_total: int, remaining, targe
 # ============================================================
 # ROUND RESULT RECORDING
 # ============================================================
+_HISTORY_FIELDS = ("round", "result", "damage", "damage_to")
+
+
+def new_round_history() -> dict:
+    """Empty per-opponent round history, stored column-wise: one list per entry field."""
+    return {field: [] for field in _HISTORY_FIELDS}
+
+
+def append_round_history(history: dict, entry: dict) -> None:
+    """Append a record_round_result() entry to a column-wise round history."""
+    for field in _HISTORY_FIELDS:
+        history[field].append(entry[field])
+
+
 def record_round_result(round_num: int, player_hp: int, opp_hp: int, intel: dict = None):
     """
     Ask what happened and update HP.
@@ -1774,8 +2138,8 @@ def record_round_result(round_num: int, player_hp: int, opp_hp: int, intel: dict
     - Survival+/Normal: voltage/saw moves by the bet amount
     Returns: (new_player_hp, new_opp_hp, round_entry_dict or None)
     """
-    enemy_trumps = set(intel.get("trumps", [])) if intel else set()
-    can_void = "Escape" in enemy_trumps or "Oblivion" in enemy_trumps
+    enemy = trump_mask(tuple(intel.get("trumps", ()))) if intel else 0
+    can_void = bool(enemy & (TRUMP_BITS["Escape"] | TRUMP_BITS["Oblivion"]))
 
     print_header("ROUND RESULT")
     print(" What happened this round?\n")
@@ -1786,7 +2150,7 @@ def record_round_result(round_num: int, player_hp: int, opp_hp: int, intel: dict
         print(" 4. VOID (Escape / Oblivion cancelled)")
     print(" 5. Cancel (go back)")
 
-    choice = input("\n Result (1-5): ").strip()
+    choice = prompt("\n Result (1-5): ").strip()
 
     if choice == "5":
         return player_hp, opp_hp, None
@@ -1808,7 +2172,7 @@ def record_round_result(round_num: int, player_hp: int, opp_hp: int, intel: dict
     try:
         print("\n How much damage was dealt?")
         print(" (The bet amount shown on screen — base is 1, trumps raise it)")
-        dmg_input = input(" Damage: ").strip()
+        dmg_input = prompt(" Damage: ").strip()
         actual_dmg = int(dmg_input) if dmg_input else 1
         actual_dmg = max(0, actual_dmg)
 
@@ -1878,7 +2242,7 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
 
             # Ask for new draws since last analyze
             print(f"\n Did you draw new cards? (space-separated, or Enter = no change)")
-            new_draw = input(" Your new cards: ").strip()
+            new_draw = prompt(" Your new cards: ").strip()
             if new_draw:
                 try:
                     new_cards = [int(x) for x in new_draw.split()]
@@ -1894,7 +2258,7 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
                     print(" Invalid input, keeping current.")
 
             print(f" Did opponent draw new cards? (space-separated, or Enter = no)")
-            new_opp = input(" Opponent new cards: ").strip()
+            new_opp = prompt(" Opponent new cards: ").strip()
             if new_opp:
                 try:
                     new_cards = [int(x) for x in new_opp.split()]
@@ -1912,7 +2276,7 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
         else:
             # First analyze this round — get all cards from scratch
             print(f"\n Enter YOUR face-down card (the hidden card dealt to you):")
-            fd_input = input(" Face-down card: ").strip()
+            fd_input = prompt(" Face-down card: ").strip()
             if not fd_input:
                 print(" No cards entered.")
                 return dead_cards, face_down_card, player_visible, opp_visible
@@ -1923,14 +2287,14 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
                 return dead_cards, face_down_card, player_visible, opp_visible
 
             print(f" Enter your visible drawn card(s) (space-separated, or Enter if none yet):")
-            vis_input = input(" Visible cards: ").strip()
+            vis_input = prompt(" Visible cards: ").strip()
             if vis_input:
                 player_visible = [int(x) for x in vis_input.split()]
             else:
                 player_visible = []
 
             print(" Enter OPPONENT'S visible card(s) (space-separated):")
-            o_input = input(" Opponent cards: ").strip()
+            o_input = prompt(" Opponent cards: ").strip()
             if not o_input:
                 print(" No opponent cards entered.")
                 return dead_cards, face_down_card, player_visible, opp_visible
@@ -1940,34 +2304,36 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
         u_hand = [face_down_card] + player_visible
         o_vis = list(opp_visible)
 
-        for c in u_hand + o_vis:
-            if c < 1 or c > 11:
-                print(f" ERROR: Card {c} invalid (1–11).")
-                return dead_cards, face_down_card, player_visible, opp_visible
+        bad = _first_invalid_card(u_hand + o_vis)
+        if bad is not None:
+            print(f" ERROR: Card {bad} invalid (1–11).")
+            return dead_cards, face_down_card, player_visible, opp_visible
 
         if dead_cards:
-            print(f" Remembered dead cards: {sorted(dead_cards)}")
+            print(f" Remembered dead cards: {dead_cards}")
             print(" Additional dead/removed cards? (Enter = none)")
         else:
             print(" Dead/removed cards? (Enter = none)")
-        d_input = input(" Dead cards: ").strip()
+        d_input = prompt(" Dead cards: ").strip()
         new_dead = list(map(int, d_input.split())) if d_input else []
-        for c in new_dead:
-            if c < 1 or c > 11:
-                print(f" ERROR: Card {c} invalid (1–11).")
-                return dead_cards, face_down_card, player_visible, opp_visible
-        dead = sorted(set(dead_cards + new_dead))
-
-        # Duplicate check (deck has one of each)
-        all_cards = u_hand + o_vis + dead
-        seen = set()
-        for c in all_cards:
-            if c in seen:
+        bad = _first_invalid_card(new_dead)
+        if bad is not None:
+            print(f" ERROR: Card {bad} invalid (1–11).")
+            return dead_cards, face_down_card, player_visible, opp_visible
+        dead = merge_dead_cards(dead_cards, new_dead)
+
+        # Duplicate check (deck has one of each), building the seen-card mask as we go
+        seen_mask = warned_mask = 0
+        for c in u_hand + o_vis + dead:
+            bit = 1 << c
+            if seen_mask & bit and not warned_mask & bit:
                 print(f" ⚠ WARNING: Card {c} entered twice! (Deck has one of each)")
-            seen.add(c)
+                warned_mask |= bit
+            seen_mask |= bit
 
-        accounted = sorted(set(all_cards))
-        remaining = [c for c in range(1, 12) if c not in accounted]
+        deck_mask = FULL_DECK_MASK ^ seen_mask
+        accounted = list(_MASK_CARDS[seen_mask])
+        remaining = list(_MASK_CARDS[deck_mask])
         u_total = sum(u_hand)
         o_total = sum(o_vis)
 
@@ -1975,24 +2341,24 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
         print("\n What did the opponent do? (Enter = nothing yet / still playing)")
         print("  2. Opponent stayed (done drawing, hidden card still unknown)")
         print("  3. I forced a draw (Love Your Enemy / similar)")
-        beh_input = input(" > ").strip()
+        beh_input = prompt(" > ").strip()
         if beh_input == "2":
             opp_behavior = "stay"
             # They stopped drawing but hidden card is unknown
             print(f" → Opponent stopped drawing. Visible total: {o_total}")
-            print(f"   Hidden card is one of: {sorted(remaining)}")
-            print(f"   Possible totals: {sorted(o_total + c for c in remaining)}")
+            print(f"   Hidden card is one of: {remaining}")
+            print(f"   Possible totals: {[o_total + c for c in remaining]}")
         elif beh_input == "3":
-            forced_raw = input(" What card did they draw? ").strip()
+            forced_raw = prompt(" What card did they draw? ").strip()
             if forced_raw:
                 forced_card = int(forced_raw)
                 if 1 <= forced_card <= 11:
                     o_total += forced_card
                     o_vis.append(forced_card)
-                    if forced_card in remaining:
-                        remaining.remove(forced_card)
-                    if forced_card not in accounted:
-                        accounted = sorted(set(accounted + [forced_card]))
+                    if deck_mask >> forced_card & 1:
+                        deck_mask ^= 1 << forced_card
+                        accounted = list(_MASK_CARDS[FULL_DECK_MASK ^ deck_mask])
+                        remaining = list(_MASK_CARDS[deck_mask])
                     print(f" → Opponent now at {o_total} (drew {forced_card})")
                 else:
                     print(" Invalid card, ignoring.")
@@ -2003,7 +2369,7 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
         display_card_matrix(accounted)
 
         safe_pct, bust_pct, perfect_draws = calculate_probabilities(remaining, u_total, target)
-        safe_count = len([c for c in remaining if u_total + c <= target])
+        safe_count = _POPCOUNT[deck_mask & _CARDS_UP_TO[min(max(target - u_total, 0), 11)]]
 
         opp_label = "OPPONENT STAYED (visible)" if opp_behavior == "stay" else "OPPONENT VISIBLE"
         print(f"\n YOUR TOTAL: {u_total} (cards: {u_hand})")
@@ -2013,15 +2379,16 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
         print(f" BUST CHANCE: {bust_pct:.0f}%")
 
         if perfect_draws:
-            print(f" PERFECT DRAW: Card(s) {sorted(perfect_draws)} → exactly {target}!")
+            print(f" PERFECT DRAW: Card(s) {perfect_draws} → exactly {target}!")
 
         if remaining:
-            print("\n If you draw:")
-            for c in sorted(remaining):
+            draw_lines = ["\n If you draw:"]
+            for c in remaining:
                 new_total = u_total + c
                 status = "✓" if new_total <= target else "✖ BUST"
                 perfect = " ★ PERFECT!" if new_total == target else ""
-                print(f"  Card {c:>2} → total {new_total:>2} {status}{perfect}")
+                draw_lines.append(f"  Card {c:>2} → total {new_total:>2} {status}{perfect}")
+            emit(*draw_lines)
 
         # Strategic advice
         print_header("STRATEGY ADVICE")
@@ -2053,7 +2420,6 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
 
         # Trump card play recommendations (suppressed when not needed)
         if trump_hand:
-            import re as _re
             trump_recs = recommend_trump_play(
                 trump_hand, u_total, o_total, remaining, target, _stay_val,
                 intel, player_hp, opp_hp, opp_behavior,
@@ -2064,12 +2430,12 @@ def analyze_round(intel: dict, player_hp: int, player_max: int, opp_hp: int, opp
                 print("\n ┌─ TRUMP CARD ADVICE ─────────────────────────────┐")
                 for rec in trump_recs:
                     # Strip ANSI for width calculation
-                    clean = _re.sub(r'\033\[[0-9;]*m', '', rec)
+                    clean = _ANSI_RE.sub('', rec)
                     while len(clean) > 53:
                         # Print first 53 visible chars
                         print(f" │ {rec[:53 + (len(rec) - len(clean))]}│")
                         rec = rec[53 + (len(rec) - len(clean)):]
-                        clean = _re.sub(r'\033\[[0-9;]*m', '', rec)
+                        clean = _ANSI_RE.sub('', rec)
                     pad = 53 - len(clean)
                     print(f" │ {rec}{' ' * pad}│")
                 print(" └─────────────────────────────────────────────────┘")
@@ -2122,7 +2488,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     print(" │  0. Cancel                                        │")
     print(" └───────────────────────────────────────────────────┘")
 
-    choice = input("\n > ").strip().upper()
+    choice = prompt("\n > ").strip().upper()
     msg = ""
 
     if choice == "0":
@@ -2132,7 +2498,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     played_trump = None
     if choice == "O":
         print(" What did the opponent play? (type trump name or describe)")
-        played_trump = input(" > ").strip()
+        played_trump = prompt(" > ").strip()
     else:
         try:
             idx = int(choice) - 1
@@ -2161,7 +2527,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     # --- BET MODIFIERS ---
     elif pt in ("desire",):
         print(f" How many trumps do YOU hold? (currently {len(trump_hand)} tracked)")
-        tc = input(" > ").strip()
+        tc = prompt(" > ").strip()
         try:
             count = int(tc) if tc else len(trump_hand)
             amt = max(1, count // 2)
@@ -2172,7 +2538,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
 
     elif pt in ("desire+",):
         print(f" How many trumps do YOU hold? (currently {len(trump_hand)} tracked)")
-        tc = input(" > ").strip()
+        tc = prompt(" > ").strip()
         try:
             count = int(tc) if tc else len(trump_hand)
             player_bet += count
@@ -2220,12 +2586,12 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     elif pt in ("curse",):
         print(" Step 1: You lost a trump card. Use W after to remove it.")
         print(" Step 2: What card were you FORCED to draw? (highest in deck)")
-        v = input(" Forced card value: ").strip()
+        v = prompt(" Forced card value: ").strip()
         if v:
             try:
                 val = int(v)
                 if 1 <= val <= 11:
-                    dead_cards = sorted(set(dead_cards + [val]))
+                    dead_cards = merge_dead_cards(dead_cards, (val,))
                     if val not in player_visible and val != face_down_card:
                         player_visible.append(val)
                     msg = f"★ Cursed! Lost a trump + forced draw: {val}. Your new total includes {val}."
@@ -2237,7 +2603,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     elif pt in ("black magic",):
         print(" Step 1: You lost half your trumps.")
         print(" Step 2: YOUR bet increased by how much?")
-        v = input(" Bet increase: ").strip()
+        v = prompt(" Bet increase: ").strip()
         try:
             amt = int(v) if v else 10
             player_bet += amt
@@ -2255,7 +2621,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
 
     elif pt in ("mind shift",):
         print(" Did you play 2+ trumps this round? (y/n)")
-        safe = input(" > ").strip().lower()
+        safe = prompt(" > ").strip().lower()
         if safe == "y":
             msg = f"{played_trump}: Blocked! You played 2+ trumps."
         else:
@@ -2264,7 +2630,7 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
 
     elif pt in ("mind shift+",):
         print(" Did you play 3+ trumps this round? (y/n)")
-        safe = input(" > ").strip().lower()
+        safe = prompt(" > ").strip().lower()
         if safe == "y":
             msg = f"{played_trump}: Blocked! You played 3+ trumps."
         else:
@@ -2281,14 +2647,14 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     # --- DRAW CARDS ---
     elif pt in ("perfect draw", "perfect draw+", "ultimate draw"):
         print(" What card did the opponent draw?")
-        v = input(" Card value: ").strip()
+        v = prompt(" Card value: ").strip()
         if v:
             try:
                 val = int(v)
                 if 1 <= val <= 11:
                     if val not in opp_visible:
                         opp_visible.append(val)
-                    dead_cards = sorted(set(dead_cards + [val]))
+                    dead_cards = merge_dead_cards(dead_cards, (val,))
                     msg = f"{played_trump}: Opponent drew {val}."
             except ValueError:
                 msg = f"{played_trump} played."
@@ -2301,9 +2667,9 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
     # --- EXCHANGE ---
     elif pt in ("exchange", "return"):
         print(" What card did YOU lose?")
-        gave_input = input(" Card lost: ").strip()
+        gave_input = prompt(" Card lost: ").strip()
         print(" What card did YOU gain?")
-        got_input = input(" Card gained: ").strip()
+        got_input = prompt(" Card gained: ").strip()
         try:
             gave = int(gave_input)
             got = int(got_input)
@@ -2329,14 +2695,14 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
         print("  2. Changed a bet")
         print("  3. Changed the target")
         print("  4. Other effect")
-        sub = input(" > ").strip()
+        sub = prompt(" > ").strip()
         if sub == "1":
             print(" What card value was affected?")
-            v = input(" > ").strip()
+            v = prompt(" > ").strip()
             msg = f"{played_trump} played (card effect). Update via A/W/X."
         elif sub == "2":
             print(" How much did YOUR bet change? (+ or - number)")
-            v = input(" > ").strip()
+            v = prompt(" > ").strip()
             try:
                 player_bet += int(v)
                 msg = f"{played_trump}: Your bet → {player_bet}"
@@ -2344,14 +2710,14 @@ def handle_interrupt(dead_cards: list, current_target: int, player_bet: int = 1,
                 msg = f"{played_trump} played. Check bet on screen."
         elif sub == "3":
             print(" New target? (17/21/24/27)")
-            v = input(" > ").strip()
+            v = prompt(" > ").strip()
             if v in ("17", "21", "24", "27"):
                 current_target = int(v)
                 msg = f"{played_trump}: Target → {current_target}"
             else:
                 msg = f"{played_trump} played."
         else:
-            desc = input(" Describe: ").strip()
+            desc = prompt(" Describe: ").strip()
             msg = f"{played_trump}: {desc}. Use W/X/A to update state."
 
     if msg:
@@ -2373,7 +2739,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
     opp_hp = int(intel["hp"])
     opp_max = int(intel["hp"])
     round_num = 0
-    round_history = []
+    round_history = new_round_history()
     current_target = 21  # Reset each round (Go For cards are "while on table")
     trump_hand = []  # Player's held trump cards — persists across rounds
 
@@ -2391,7 +2757,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
             print(f"  {i}. {key} — Trumps: {trumps_str}")
         print(f"  {len(variant_keys) + 1}. Not sure (use combined loadout)")
 
-        v_input = input("\n > ").strip()
+        v_input = prompt("\n > ").strip()
         try:
             v_idx = int(v_input) - 1
             if 0 <= v_idx < len(variant_keys):
@@ -2409,6 +2775,11 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
 
     display_opponent_info(intel)
 
+    # Fixed for the rest of the fight once the variant is chosen
+    opp_name = intel["name"]
+    enemy_trump_effects = [t for t in intel.get("trumps", [])
+                           if t in ("Curse", "Mind Shift", "Mind Shift+", "Desire", "Desire+", "Happiness")]
+
     # Always enter starting trump hand — you always begin with trumps
     print("\n Enter your starting trump cards:")
     trump_hand = edit_trump_hand(trump_hand, available_trumps)
@@ -2422,9 +2793,9 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
         face_down_card = None  # Your face-down card — locked once set
         player_visible = []   # Your visible drawn cards — remembered across re-analyzes
         opp_visible = []      # Opponent's visible cards — remembered across re-analyzes
-        print_header(f"ROUND {round_num} vs. {intel['name']}")
+        print_header(f"ROUND {round_num} vs. {opp_name}")
         display_round_history(round_history)
-        display_hp_status(player_hp, player_max, opp_hp, opp_max, intel["name"])
+        display_hp_status(player_hp, player_max, opp_hp, opp_max, opp_name)
 
         # ── LUCAS SAW ROUND HARD BYPASS ──
         # Normal 21 final round: Lucas cheats with Desperation + Perfect Draw.
@@ -2452,10 +2823,10 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
  ⚠ If you don't have 'Love Your Enemy', you CANNOT win.
 """)
             print("=" * 60)
-            input("\n Press Enter once this round concludes...")
+            prompt("\n Press Enter once this round concludes...")
             player_hp, opp_hp, entry = record_round_result(round_num, player_hp, opp_hp, intel)
             if entry is not None:
-                round_history.append(entry)
+                append_round_history(round_history, entry)
             continue
 
         while True:
@@ -2470,7 +2841,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
             print(f" P. Play a trump card ({trump_count} in hand)")
             print(f" W. Edit trump hand ({trump_count} cards)")
             print(" D. Done — record round result")
-            dead_label = f" ({sorted(dead_cards)})" if dead_cards else " (none)"
+            dead_label = f" ({dead_cards})" if dead_cards else " (none)"
             print(f" X. Dead cards{dead_label}")
             print(" T. Trump card reference")
             print(" O. Opponent intel")
@@ -2478,7 +2849,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
             print(" S. HP status")
             print(" Q. Quit fight")
 
-            action = input("\n Action: ").strip().upper()
+            action = prompt("\n Action: ").strip().upper()
 
             if action == "A":
                 dead_cards, face_down_card, player_visible, opp_visible = analyze_round(intel, player_hp, player_max, opp_hp, opp_max, current_target, dead_cards, challenges_completed, available_trumps, trump_hand, fight_num=fight_num, mode_key=mode_key, face_down_card=face_down_card, player_visible=player_visible, opp_visible=opp_visible)
@@ -2489,7 +2860,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                     continue
                 display_trump_hand(trump_hand)
                 print("\n Which card to play? (number, or Enter to cancel)")
-                p_input = input(" > ").strip()
+                p_input = prompt(" > ").strip()
                 if not p_input:
                     continue
                 try:
@@ -2497,7 +2868,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                     if 0 <= idx < len(trump_hand):
                         played = trump_hand[idx]
                         print(f"\n Playing: {played}")
-                        print(f" Effect: {TRUMPS.get(played, {}).get('desc', '?')}")
+                        print(f" Effect: {TRUMP_DESC.get(played, '?')}")
 
                         # Handle target changers — auto-updates target
                         if played in ("Go for 17", "Go for 24", "Go for 27"):
@@ -2522,7 +2893,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                             trump_hand.pop(idx)
                             print(f" ★ Returned opponent's last face-up card to deck. Opp bet +2 → now {opp_bet}.")
                             print(" What card was returned? (value)")
-                            r_input = input(" > ").strip()
+                            r_input = prompt(" > ").strip()
                             if r_input:
                                 try:
                                     rv = int(r_input)
@@ -2547,7 +2918,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                         # Handle Return (needs current hand state — ask for card)
                         elif played == "Return":
                             print(" Which card are you returning? (card value)")
-                            ret_input = input(" > ").strip()
+                            ret_input = prompt(" > ").strip()
                             if ret_input:
                                 try:
                                     ret_card = int(ret_input)
@@ -2569,12 +2940,12 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                         # Handle Remove
                         elif played == "Remove":
                             print(" Which opponent card was removed? (card value)")
-                            rem_input = input(" > ").strip()
+                            rem_input = prompt(" > ").strip()
                             if rem_input:
                                 try:
                                     rem_card = int(rem_input)
                                     if 1 <= rem_card <= 11:
-                                        dead_cards = sorted(set(dead_cards + [rem_card]))
+                                        dead_cards = merge_dead_cards(dead_cards, (rem_card,))
                                         # Remove from opponent hand memory
                                         if rem_card in opp_visible:
                                             opp_visible.remove(rem_card)
@@ -2590,9 +2961,9 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                         # Handle Exchange
                         elif played == "Exchange":
                             print(" What card did you give? (your card value)")
-                            give_input = input(" > ").strip()
+                            give_input = prompt(" > ").strip()
                             print(" What card did you take? (opponent's card value)")
-                            take_input = input(" > ").strip()
+                            take_input = prompt(" > ").strip()
                             if give_input and take_input:
                                 try:
                                     gave = int(give_input)
@@ -2619,7 +2990,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                         # Handle Love Your Enemy
                         elif played == "Love Your Enemy":
                             print(" What card did the opponent draw?")
-                            lye_input = input(" > ").strip()
+                            lye_input = prompt(" > ").strip()
                             if lye_input:
                                 try:
                                     drawn = int(lye_input)
@@ -2636,7 +3007,7 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                         # Handle Perfect Draw / Ultimate Draw
                         elif played in ("Perfect Draw", "Perfect Draw+", "Ultimate Draw"):
                             print(" What card did you draw?")
-                            pd_input = input(" > ").strip()
+                            pd_input = prompt(" > ").strip()
                             if pd_input:
                                 try:
                                     drawn = int(pd_input)
@@ -2661,9 +3032,9 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                             print(f"\n Did the draw succeed? (Was {card_val} still in the deck?)")
                             print(f"  Y = yes, drew {card_val}")
                             print(f"  N = no, nothing happened (card not in deck)")
-                            result = input(" > ").strip().upper()
+                            result = prompt(" > ").strip().upper()
                             if result == "Y":
-                                dead_cards = sorted(set(dead_cards + [card_val]))
+                                dead_cards = merge_dead_cards(dead_cards, (card_val,))
                                 trump_hand.pop(idx)
                                 print(f" ★ Drew {card_val}. Added to your hand.")
                             elif result == "N":
@@ -2701,25 +3072,25 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
 
             elif action == "X":
                 if dead_cards:
-                    print(f"\n Dead cards: {sorted(dead_cards)}")
+                    print(f"\n Dead cards: {dead_cards}")
                     print(" Options: Enter = keep, 'c' = clear all, or enter cards to add")
-                    x_input = input(" > ").strip().lower()
+                    x_input = prompt(" > ").strip().lower()
                     if x_input == "c":
                         dead_cards = []
                         print(" Dead cards cleared.")
                     elif x_input:
                         try:
                             new_cards = [int(x) for x in x_input.split()]
-                            dead_cards = sorted(set(dead_cards + [c for c in new_cards if 1 <= c <= 11]))
+                            dead_cards = merge_dead_cards(dead_cards, [c for c in new_cards if 1 <= c <= 11])
                             print(f" Dead cards: {dead_cards}")
                         except ValueError:
                             print(" Invalid input.")
                 else:
                     print("\n No dead cards yet. Enter cards to add (or Enter to skip):")
-                    x_input = input(" > ").strip()
+                    x_input = prompt(" > ").strip()
                     if x_input:
                         try:
-                            dead_cards = sorted(set(int(x) for x in x_input.split() if 1 <= int(x) <= 11))
+                            dead_cards = merge_dead_cards((), [int(x) for x in x_input.split() if 1 <= int(x) <= 11])
                             print(f" Dead cards: {dead_cards}")
                         except ValueError:
                             print(" Invalid input.")
@@ -2729,39 +3100,38 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                 if entry is None:
                     # User cancelled — stay in current round
                     continue
-                round_history.append(entry)
+                append_round_history(round_history, entry)
 
-                display_hp_status(player_hp, player_max, opp_hp, opp_max, intel["name"])
+                display_hp_status(player_hp, player_max, opp_hp, opp_max, opp_name)
 
                 if opp_hp <= 0:
-                    print(f"\n ★★★ {intel['name']} DEFEATED! ★★★")
+                    print(f"\n ★★★ {opp_name} DEFEATED! ★★★")
                     print(f" Rounds fought: {round_num}")
-                    wins = sum(1 for e in round_history if e["result"] == "WIN")
-                    losses = sum(1 for e in round_history if e["result"] == "LOSS")
-                    voids = sum(1 for e in round_history if e["result"] == "VOID")
-                    ties = sum(1 for e in round_history if e["result"] == "TIE")
+                    tally = Counter(round_history["result"])
+                    wins = tally["WIN"]
+                    losses = tally["LOSS"]
+                    voids = tally["VOID"]
+                    ties = tally["TIE"]
                     print(f" Record: {wins}W / {losses}L / {ties}T / {voids}V")
                     break
 
                 if player_hp <= 0:
-                    print(f"\n ✖✖✖ YOU DIED vs. {intel['name']} ✖✖✖")
+                    print(f"\n ✖✖✖ YOU DIED vs. {opp_name} ✖✖✖")
                     print(f" Rounds survived: {round_num}")
                     break
 
                 # Round recorded and neither died → ask about trump changes
-                enemy_trump_effects = [t for t in intel.get("trumps", [])
-                                       if t in ("Curse", "Mind Shift", "Mind Shift+", "Desire", "Desire+", "Happiness")]
                 if enemy_trump_effects or trump_hand:
                     print(f"\n Did your trump hand change this round? (opponent trumps, draws, etc.)")
                     print(f"  Current hand: {trump_hand if trump_hand else '(empty)'}")
                     print(f"  Y = edit hand, Enter = no changes")
-                    if input(" > ").strip().lower() == "y":
+                    if prompt(" > ").strip().lower() == "y":
                         trump_hand = edit_trump_hand(trump_hand, available_trumps)
                 break
 
             elif action == "T":
                 display_trumps_reference()
-                input(" Press Enter to continue...")
+                prompt(" Press Enter to continue...")
 
             elif action == "O":
                 display_opponent_info(intel)
@@ -2770,10 +3140,10 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
                 display_round_history(round_history)
 
             elif action == "S":
-                display_hp_status(player_hp, player_max, opp_hp, opp_max, intel["name"])
+                display_hp_status(player_hp, player_max, opp_hp, opp_max, opp_name)
 
             elif action == "Q":
-                confirm = input(" Quit fight? Progress is lost. (y/n): ").strip().lower()
+                confirm = prompt(" Quit fight? Progress is lost. (y/n): ").strip().lower()
                 if confirm == "y":
                     return player_hp
 
@@ -2787,26 +3157,19 @@ def fight_opponent(intel: dict, player_hp: int, player_max: int,
 # MODE RUNNERS
 # ============================================================
 def get_opponent_list(mode_key: str):
-    if mode_key == "1":
-        return OPPONENTS_NORMAL
-    if mode_key == "2":
-        return OPPONENTS_SURVIVAL
-    if mode_key == "3":
-        # Survival+ uses dynamic selection — return pool for reference
-        return OPPONENTS_SURVIVAL_PLUS
-    return []
+    return _OPPONENT_LISTS.get(mode_key, ())
 
 
 def select_survival_plus_opponent(fight_num: int, available_trumps: set = None) -> dict:
     """Select the opponent for a given Survival+ fight number (1-10)."""
     if fight_num == 5:
         print(f"\n ★ Fight #{fight_num} is ALWAYS Molded Hoffman (mid-boss)!")
-        input(" Press Enter to continue...")
+        prompt(" Press Enter to continue...")
         return BOSS_SURVIVAL_PLUS_MID
 
     if fight_num == 10:
         print(f"\n ★ Fight #{fight_num} is ALWAYS Undead Hoffman (final boss)!")
-        input(" Press Enter to continue...")
+        prompt(" Press Enter to continue...")
         return BOSS_SURVIVAL_PLUS_FINAL
 
     print(f"\n Who are you facing for fight #{fight_num}?")
@@ -2814,24 +3177,25 @@ def select_survival_plus_opponent(fight_num: int, available_trumps: set = None)
 
     pool = OPPONENTS_SURVIVAL_PLUS
     harvest_unlocked = available_trumps is not None and "Harvest" in available_trumps
-    for i, opp in enumerate(pool):
-        label = f" {i + 1}. {opp['name']} — {opp.get('desc', '')}"
+    if harvest_unlocked:
+        emit(*_SURVIVAL_PLUS_LABELS)
+    else:
         # Flag Mr. Big Head as priority if Harvest not yet unlocked
-        if "Big Head" in opp["name"] and not harvest_unlocked:
-            label += " \033[96m★ PRIORITY TARGET (unlocks Harvest!)\033[0m"
-        print(label)
+        emit(*(label + " \033[96m★ PRIORITY TARGET (unlocks Harvest!)\033[0m"
+               if i in _SURVIVAL_PLUS_BIG_HEAD else label
+               for i, label in enumerate(_SURVIVAL_PLUS_LABELS)))
 
     if not harvest_unlocked:
         print(f"\n \033[96m★ TIP: If Mr. Big Head appears, prioritize beating him!\033[0m")
         print(f"   Defeating him twice unlocks 'Harvest' (trump draw after every trump you play).")
 
     while True:
-        choice = input(f"\n Select (1-{len(pool)}): ").strip()
+        choice = prompt(f"\n Select (1-{len(pool)}): ").strip()
         try:
             idx = int(choice) - 1
             if 0 <= idx < len(pool):
                 selected = pool[idx]
-                if "Big Head" in selected["name"] and not harvest_unlocked:
+                if idx in _SURVIVAL_PLUS_BIG_HEAD and not harvest_unlocked:
                     print(f"\n \033[96m★ Mr. Big Head — PRIORITY: Beat him to unlock Harvest!\033[0m")
                     print(f"   Watch for 'Escape' — save Destroy to counter it!")
                 return selected
@@ -2866,13 +3230,16 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
     no_damage = True  # Flips to False on first damage
 
     print_header(f"{mode['name']}")
-    print(f"\n {mode['rules']}")
-    print(f"\n Starting HP: {player_hp}")
-    print(f" Opponents: {total_opponents}")
+    lines = [
+        f"\n {mode['rules']}",
+        f"\n Starting HP: {player_hp}",
+        f" Opponents: {total_opponents}",
+    ]
     if no_damage_relevant:
-        print(f" \033[92m★ NO-DAMAGE CHALLENGE ACTIVE — tracking automatically.\033[0m")
-        print(f"   Take zero damage to unlock Ultimate Draw!")
-    input("\n Press Enter to begin...")
+        lines.append(" \033[92m★ NO-DAMAGE CHALLENGE ACTIVE — tracking automatically.\033[0m")
+        lines.append("   Take zero damage to unlock Ultimate Draw!")
+    emit(*lines)
+    prompt("\n Press Enter to begin...")
 
     for idx in range(total_opponents):
         fight_num = idx + 1
@@ -2894,7 +3261,7 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
         print(f" Next: {opp['name']} ({opp.get('ai','?')}) — {opp['hp']} HP")
 
         if idx > 0:
-            ready = input("\n Ready? (Enter = yes, q = quit): ").strip().lower()
+            ready = prompt("\n Ready? (Enter = yes, q = quit): ").strip().lower()
             if ready == "q":
                 print(" Returning to menu.")
                 return
@@ -2918,7 +3285,7 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
             if remaining_fights > 0:
                 print(f"   {remaining_fights} fights remaining. Ultimate Draw requires zero damage.")
                 print(f"   \033[96mRestart run for a fresh no-damage attempt? (y/n)\033[0m")
-                if input("   > ").strip().lower() == "y":
+                if prompt("   > ").strip().lower() == "y":
                     print(" Restarting run...")
                     return
                 print("   Continuing run (no-damage challenge voided).")
@@ -2938,7 +3305,7 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
                 print(f"\n \033[91m⚠ WARNING: {player_hp} HP with {remaining_fights} fights remaining.\033[0m")
                 print(f" \033[91m  Win probability is very low (~{int(survival_ratio * 100)}% survival rate per fight needed).\033[0m")
                 print(f" \033[91m  RECOMMENDATION: Consider restarting the run for a better attempt.\033[0m")
-                restart = input("\n Restart run? (y/n): ").strip().lower()
+                restart = prompt("\n Restart run? (y/n): ").strip().lower()
                 if restart == "y":
                     print(" Restarting run...")
                     return
@@ -2947,8 +3314,10 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
 
     if player_hp > 0:
         print_header(f"★ {mode['name']} COMPLETE! ★")
-        print(f" All {total_opponents} opponents defeated!")
-        print(f" Remaining HP: {player_hp}/{player_max}")
+        emit(
+            f" All {total_opponents} opponents defeated!",
+            f" Remaining HP: {player_hp}/{player_max}",
+        )
 
         if no_damage_relevant and no_damage:
             print(f"\n \033[92m★★★ NO-DAMAGE RUN COMPLETE! ★★★\033[0m")
@@ -2961,31 +3330,45 @@ def run_mode(mode_key: str, challenges_completed: set = None, available_trumps:
             print(" TROPHY: Survival+ complete!")
 
 
+_FREE_PLAY_MENU = None
+
+
+def _free_play_menu() -> tuple:
+    """Build (once) the free-play opponent menu text and its flattened opponent tuple."""
+    global _FREE_PLAY_MENU
+    if _FREE_PLAY_MENU is None:
+        lines = []
+        num = 0
+        sections = [
+            ("Normal", OPPONENTS_NORMAL),
+            ("Survival", OPPONENTS_SURVIVAL),
+            ("Survival+ (Random Pool)", OPPONENTS_SURVIVAL_PLUS),
+            ("Survival+ (Bosses)", [BOSS_SURVIVAL_PLUS_MID, BOSS_SURVIVAL_PLUS_FINAL]),
+        ]
+        for section_name, opp_list in sections:
+            lines.append(f"\n --- {section_name} ---")
+            for opp in opp_list:
+                num += 1
+                lines.append(f" {num:>2}. {opp['name']} — {opp.get('ai','?')} ({opp['hp']} HP)")
+        # Sections list the opponents in _ALL_OPPONENTS order.
+        _FREE_PLAY_MENU = ("\n".join(lines), _ALL_OPPONENTS)
+    return _FREE_PLAY_MENU
+
+
 def run_free_play(challenges_completed: set = None, available_trumps: set = None) -> None:
     """Pick any opponent for practice."""
     print_header("FREE PLAY — SELECT OPPONENT")
 
-    all_opps = []
-    sections = [
-        ("Normal", OPPONENTS_NORMAL),
-        ("Survival", OPPONENTS_SURVIVAL),
-        ("Survival+ (Random Pool)", OPPONENTS_SURVIVAL_PLUS),
-        ("Survival+ (Bosses)", [BOSS_SURVIVAL_PLUS_MID, BOSS_SURVIVAL_PLUS_FINAL]),
-    ]
-
-    for section_name, opp_list in sections:
-        print(f"\n --- {section_name} ---")
-        for opp in opp_list:
-            all_opps.append(opp)
-            print(f" {len(all_opps):>2}. {opp['name']} — {opp.get('ai','?')} ({opp['hp']} HP)")
+    menu_text, all_opps = _free_play_menu()
+    emit(menu_text)
 
-    choice = input(f"\n Select opponent (1-{len(all_opps)}): ").strip()
+    choice = prompt(f"\n Select opponent (1-{len(all_opps)}): ").strip()
     try:
         idx = int(choice) - 1
         if 0 <= idx < len(all_opps):
             opp = all_opps[idx]
             print("\n Set YOUR starting HP (default 10):")
-            hp_input = input(" > ").strip()
+            hp_input = prompt(" > ").strip()
             player_hp = int(hp_input) if hp_input else 10
             player_max = player_hp
             fight_opponent(opp, player_hp, player_max, challenges_completed, available_trumps,
@@ -3000,40 +3383,76 @@ def run_free_play(challenges_completed: set = None, available_trumps: set = None
 # ============================================================
 # MAIN MENU
 # ============================================================
+def _menu_quit(choice: str, session: dict) -> bool:
+    print("\n Good luck, Clancy. Don't let Lucas win.\n")
+    return False
+
+
+def _menu_reference(choice: str, session: dict) -> bool:
+    display_trumps_reference()
+    prompt(" Press Enter to continue...")
+    return True
+
+
+def _menu_update_progress(choice: str, session: dict) -> bool:
+    session["challenges_completed"], session["available_trumps"] = setup_challenge_progress(force_prompt=True)
+    prompt(" Press Enter to continue...")
+    return True
+
+
+def _menu_run_mode(choice: str, session: dict) -> bool:
+    run_mode(choice, session["challenges_completed"], session["available_trumps"])
+    prompt("\n Press Enter to return to menu...")
+    return True
+
+
+def _menu_free_play(choice: str, session: dict) -> bool:
+    run_free_play(session["challenges_completed"], session["available_trumps"])
+    prompt("\n Press Enter to return to menu...")
+    return True
+
+
+# Main menu transitions: key → handler(choice, session). A handler returns
+# False to leave the menu loop.
+MAIN_MENU_ACTIONS = {
+    "Q": _menu_quit,
+    "R": _menu_reference,
+    "U": _menu_update_progress,
+    "1": _menu_run_mode,
+    "2": _menu_run_mode,
+    "3": _menu_run_mode,
+    "4": _menu_free_play,
+}
+
+
 def main() -> None:
     challenges_completed, available_trumps = setup_challenge_progress()
+    session = {"challenges_completed": challenges_completed, "available_trumps": available_trumps}
 
     while True:
         print_header("RESIDENT EVIL 7: 21 — CARD GAME SOLVER")
-        print("\n SELECT MODE:\n")
-        print(" 1. Normal 21 (vs. Lucas — tutorial) ⚠ limited accuracy")
-        print(" 2. Survival 21 (5-opponent gauntlet)")
-        print(" 3. Survival+ 21 (10-opponent hard gauntlet)")
-        print(" 4. Free Play (pick any opponent)")
-        print()
-        print(" R. Trump Card Reference")
-        print(f" U. Update challenge progress ({len(challenges_completed)} completed)")
-        print(" Q. Quit")
-
-        choice = input("\n Select: ").strip().upper()
-
-        if choice == "Q":
-            print("\n Good luck, Clancy. Don't let Lucas win.\n")
+        emit(
+            "\n SELECT MODE:\n",
+            " 1. Normal 21 (vs. Lucas — tutorial) ⚠ limited accuracy",
+            " 2. Survival 21 (5-opponent gauntlet)",
+            " 3. Survival+ 21 (10-opponent hard gauntlet)",
+            " 4. Free Play (pick any opponent)",
+            "",
+            " R. Trump Card Reference",
+            f" U. Update challenge progress ({len(session['challenges_completed'])} completed)",
+            " Q. Quit",
+        )
+
+        try:
+            choice = prompt("\n Select: ").strip().upper()
+            action = MAIN_MENU_ACTIONS.get(choice)
+            if action is None:
+                print(" Invalid selection.")
+            elif not action(choice, session):
+                break
+        except (EOFError, KeyboardInterrupt):
+            print("\n\n Exiting. Good luck, Clancy.\n")
             break
-        elif choice == "R":
-            display_trumps_reference()
-            input(" Press Enter to continue...")
-        elif choice == "U":
-            challenges_completed, available_trumps = setup_challenge_progress(force_prompt=True)
-            input(" Press Enter to continue...")
-        elif choice in ("1", "2", "3"):
-            run_mode(choice, challenges_completed, available_trumps)
-            input("\n Press Enter to return to menu...")
-        elif choice == "4":
-            run_free_play(challenges_completed, available_trumps)
-            input("\n Press Enter to return to menu...")
-        else:
-            print(" Invalid selection.")
 
 
 if __name__ == "__main__":